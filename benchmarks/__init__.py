@@ -0,0 +1,22 @@
+"""
+Benchmarks for the episode graphs and production patterns.
+
+Run a benchmark from the repository root, e.g.:
+
+    python -m benchmarks.bench_resilience
+    python -m benchmarks.suite run --out results.json
+
+See README.md for the full list.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PRODUCTION_DIR = REPO_ROOT / "episode-06-production-patterns"
+
+# Episode folders aren't packages, so make the Episode 6 helpers importable
+if str(PRODUCTION_DIR) not in sys.path:
+    sys.path.insert(0, str(PRODUCTION_DIR))
+
+from demo_helpers import load_episode  # noqa: E402  (shared with the Episode 6 demos)
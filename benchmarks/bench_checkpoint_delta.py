@@ -0,0 +1,98 @@
+"""
+Benchmark: DeltaCheckpointSaver vs MemorySaver
+==============================================
+Runs Episode 2's agent (with a fake, instant model) for threads of
+10 to 1000 turns and reports, per checkpointer:
+
+- bytes written per turn (averaged over the thread, and for the last turn)
+- total bytes stored
+- restore time: reading the latest state of the thread with a cold cache
+
+    python -m benchmarks.bench_checkpoint_delta --turns 10,100,1000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from benchmarks import load_episode
+from demo_helpers import FakeChatModel
+from delta_checkpoint import DeltaCheckpointSaver
+
+
+def memory_saver_bytes(saver: MemorySaver) -> int:
+    """Bytes MemorySaver holds: checkpoints, channel blobs and pending writes."""
+    total = sum(
+        len(checkpoint[1]) + len(metadata[1])
+        for namespaces in saver.storage.values()
+        for checkpoints in namespaces.values()
+        for checkpoint, metadata, _ in checkpoints.values()
+    )
+    total += sum(len(blob[1]) for blob in saver.blobs.values())
+    total += sum(len(w[2][1]) for writes in saver.writes.values() for w in writes.values())
+    return total
+
+
+def stored_bytes(saver) -> int:
+    if isinstance(saver, DeltaCheckpointSaver):
+        return saver.stored_bytes()
+    return memory_saver_bytes(saver)
+
+
+def run_thread(agent, saver, turns: int) -> dict:
+    config = {"configurable": {"thread_id": f"bench-{turns}"}}
+    last_turn_bytes = 0
+    for turn in range(turns):
+        before = stored_bytes(saver)
+        agent.invoke({"messages": [HumanMessage(content=f"Message number {turn}, padded a bit.")]}, config)
+        last_turn_bytes = stored_bytes(saver) - before
+
+    if isinstance(saver, DeltaCheckpointSaver):
+        saver._states.clear()  # Cold cache: force a rebuild from snapshot + deltas
+    start = time.perf_counter()
+    state = agent.get_state(config)
+    restore = time.perf_counter() - start
+    assert len(state.values["messages"]) == 2 * turns
+
+    total = stored_bytes(saver)
+    return {
+        "total_bytes": total,
+        "bytes_per_turn": total / turns,
+        "last_turn_bytes": last_turn_bytes,
+        "restore_ms": restore * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", default="10,100,1000", help="comma-separated thread lengths")
+    parser.add_argument("--snapshot-every", type=int, default=50)
+    args = parser.parse_args()
+
+    memory = load_episode("episode-02-memory-and-state/01_agent_with_memory.py")
+    savers = {
+        "MemorySaver": MemorySaver,
+        "DeltaSaver": lambda: DeltaCheckpointSaver(snapshot_every=args.snapshot_every),
+    }
+
+    print(f"\n{'turns':>6} {'checkpointer':<12} {'total KB':>10} {'B/turn':>10} "
+          f"{'last turn B':>12} {'restore ms':>11}")
+    print("-" * 66)
+    for turns in [int(t) for t in args.turns.split(",")]:
+        for name, make_saver in savers.items():
+            saver = make_saver()
+            agent = memory.create_agent_with_memory(llm=FakeChatModel(), checkpointer=saver)
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = run_thread(agent, saver, turns)
+            print(f"{turns:>6} {name:<12} {stats['total_bytes'] / 1024:>10.1f} "
+                  f"{stats['bytes_per_turn']:>10.0f} {stats['last_turn_bytes']:>12} "
+                  f"{stats['restore_ms']:>11.2f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: framework overhead only
+==================================
+Runs each episode's graph with zero-latency fake models, so all that is
+left is the framework: nodes' own code, routers, reducers, checkpoint
+serialization, tool dispatch and LangGraph's scheduling.
+
+For every graph it reports the plain invoke time, the same runs under
+GraphProfiler (tracing only) and where that time went. Pass `--flame-dir`
+to also write sampled collapsed stacks per graph (a separate pass, since
+sampling slows the run down).
+
+    python -m benchmarks.bench_framework_overhead --runs 200 --flame-dir /tmp/flames
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from pathlib import Path
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from benchmarks import load_episode
+from demo_helpers import FakeChatModel, support_responder, tool_round_trip
+from profiling import KINDS, GraphProfiler
+
+
+def graphs():
+    """(name, compiled graph, input) for every episode graph, with instant fakes."""
+    simple = load_episode("episode-01-langgraph-basics/01_simple_agent.py")
+    with_tool = load_episode("episode-01-langgraph-basics/02_agent_with_tool.py")
+    memory = load_episode("episode-02-memory-and-state/01_agent_with_memory.py")
+    routing = load_episode("episode-03-conditional-logic/01_conditional_routing.py")
+
+    with_tool.ChatAnthropic = lambda **kwargs: FakeChatModel(responder=tool_round_trip())
+    support_llm = FakeChatModel(responder=support_responder())
+    question = {"messages": [HumanMessage(content="What is 12 times 7?")]}
+    ticket = {"messages": [HumanMessage(content="I was charged twice")]}
+
+    return [
+        ("ep01 simple_agent", simple.create_simple_agent(), {"message": "Hi there!"}),
+        ("ep01 agent_with_tool", with_tool.create_agent(), question),
+        ("ep02 agent_with_memory", memory.create_agent_with_memory(
+            llm=FakeChatModel(responder=tool_round_trip()), checkpointer=MemorySaver()), question),
+        ("ep03 support_agent", routing.create_support_agent(
+            checkpointer=MemorySaver(), llm=support_llm), ticket),
+        ("ep03 support_agent (multi-label)", routing.create_support_agent(
+            multi_label=True, checkpointer=MemorySaver(), llm=support_llm), ticket),
+    ]
+
+
+def run(invoke, inputs, runs: int) -> float:
+    """Mean seconds per invoke, each run on a fresh thread_id."""
+    start = time.perf_counter()
+    for i in range(runs):
+        invoke(inputs, {"configurable": {"thread_id": f"bench-{i}"}})
+    return (time.perf_counter() - start) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--flame-dir", help="write sampled collapsed stacks here")
+    args = parser.parse_args()
+
+    columns = KINDS + ["framework"]
+    print(f"\n{'graph':<34} {'plain ms':>9} {'traced ms':>10} " + " ".join(f"{k[:10]:>10}" for k in columns))
+    print("-" * (56 + 11 * len(columns)))
+
+    for name, graph, inputs in graphs():
+        with contextlib.redirect_stdout(io.StringIO()):  # The episodes print as they go
+            run(graph.invoke, inputs, 5)  # Warm up
+            plain = run(graph.invoke, inputs, args.runs)
+            with GraphProfiler(graph, sample_interval=None) as profiler:
+                run(profiler.invoke, inputs, args.runs)
+
+        totals = profiler.totals_by_kind()
+        traced = profiler.run_wall / profiler.runs
+        shares = " ".join(f"{totals[k] / profiler.run_wall:>10.1%}" for k in columns)
+        print(f"{name:<34} {plain * 1000:>9.3f} {traced * 1000:>10.3f} {shares}")
+
+        if args.flame_dir:
+            sampler = GraphProfiler(graph)
+            with contextlib.redirect_stdout(io.StringIO()), sampler:
+                run(sampler.invoke, inputs, args.runs)
+            slug = name.replace(" ", "_").replace("(", "").replace(")", "")
+            Path(args.flame_dir).mkdir(parents=True, exist_ok=True)
+            sampler.write_collapsed(Path(args.flame_dir) / f"{slug}.folded")
+
+    print("\nShares are of traced wall time. \"node\" excludes model/tool/router time inside nodes.")
+    if args.flame_dir:
+        print(f"Collapsed stacks written to {args.flame_dir}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
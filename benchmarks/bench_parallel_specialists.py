@@ -0,0 +1,73 @@
+"""
+Benchmark: fan-out/fan-in specialists in the Episode 3 support agent
+====================================================================
+Runs `create_support_agent` with fake models that take `--latency` seconds
+per call, and measures wall time per ticket as the number of relevant
+specialists grows from 1 to 3.
+
+Sequential specialists would cost (1 + N) x latency. With the multi-label
+mode they share one super-step, so wall time should stay close to
+2 x latency (categorize + one round of specialists) whatever N is.
+
+    python -m benchmarks.bench_parallel_specialists --latency 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import time
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks import load_episode
+from demo_helpers import FakeChatModel
+
+
+def scores_for(width: int) -> dict[str, float]:
+    """Fake relevance scores that make exactly `width` specialists relevant."""
+    categories = ["billing", "technical", "general"]
+    return {c: (0.9 if i < width else 0.1) for i, c in enumerate(categories)}
+
+
+def time_ticket(agent, turns: int) -> list[float]:
+    timings = []
+    for turn in range(turns):
+        config = {"configurable": {"thread_id": f"bench-{turn}"}}
+        start = time.perf_counter()
+        agent.invoke({"messages": [HumanMessage(content="Charged twice after a crash")]}, config=config)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per fake model call")
+    parser.add_argument("--turns", type=int, default=5, help="tickets per configuration")
+    args = parser.parse_args()
+
+    routing = load_episode("episode-03-conditional-logic/01_conditional_routing.py")
+
+    print(f"\nFake model latency: {args.latency * 1000:.0f} ms per call, {args.turns} tickets each\n")
+    print(f"{'mode':<14} {'specialists':>11} {'median ms':>10} {'vs 1 call':>10} {'sequential ms':>14}")
+    print("-" * 63)
+
+    for width in (1, 2, 3):
+        scores = json.dumps(scores_for(width))
+        fake = FakeChatModel(
+            latency=args.latency,
+            responder=lambda messages: scores if "JSON" in messages[-1].content else "Here to help!",
+        )
+        agent = routing.create_support_agent(multi_label=True, max_fan_out=3, llm=fake)
+        with contextlib.redirect_stdout(io.StringIO()):  # Hide the nodes' prints
+            median = statistics.median(time_ticket(agent, args.turns))
+
+        sequential = (1 + width) * args.latency
+        print(f"{'multi-label':<14} {width:>11} {median * 1000:>10.1f} "
+              f"{median / (2 * args.latency):>9.2f}x {sequential * 1000:>14.1f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
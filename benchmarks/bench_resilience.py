@@ -0,0 +1,115 @@
+"""
+Benchmark: resilience layer vs. plain model calls
+=================================================
+Sends the same workload to the fault-injecting fake server three ways:
+
+- plain:    `model.invoke(...)` as in Episodes 1-3
+- retries:  ResilientChatModel with jittered retries only
+- hedged:   ResilientChatModel with retries + hedged requests
+
+and reports success rate and latency percentiles (p50/p95/p99).
+
+Before the timed workload, each variant makes `--warmup` calls against a
+fault-free server, so hedging already knows the usual latency when timing
+starts. Warm-up calls are not in the percentiles.
+
+    python -m benchmarks.bench_resilience --calls 400 --slow-rate 0.05
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import HumanMessage
+
+from fault_server import FaultConfig, FaultServer, FaultServerChatModel
+from resilience import HedgePolicy, ResilientChatModel, RetryPolicy
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(len(ordered) * pct / 100 + 0.5)) - 1)
+    return ordered[max(0, index)]
+
+
+def run_workload(llm, calls: int, concurrency: int) -> dict:
+    """Call the model `calls` times and time each call, successful or not."""
+    def one_call(i: int) -> tuple[float, bool]:
+        start = time.perf_counter()
+        try:
+            llm.invoke([HumanMessage(content=f"request {i}")])
+            ok = True
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one_call, range(calls)))
+
+    latencies = [latency for latency, _ in results]
+    return {
+        "success_rate": sum(ok for _, ok in results) / calls,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--warmup", type=int, default=50, help="untimed calls per variant, without faults")
+    args = parser.parse_args()
+
+    faults = FaultConfig(
+        error_rate=args.error_rate,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        seed=args.seed,
+    )
+
+    def make_model(server: FaultServer, name: str) -> FaultServerChatModel:
+        # Each variant gets its own model name, so breakers and latency stats don't mix.
+        # The warm-up and timed models share a name, so they share the latency history.
+        return FaultServerChatModel(url=server.url, model=name)
+
+    variants = {
+        "plain": lambda s: make_model(s, "bench-plain"),
+        "retries": lambda s: ResilientChatModel(
+            make_model(s, "bench-retries"),
+            retry=RetryPolicy(max_attempts=4, base_delay=0.02),
+            failure_threshold=10_000,
+        ),
+        "hedged": lambda s: ResilientChatModel(
+            make_model(s, "bench-hedged"),
+            retry=RetryPolicy(max_attempts=4, base_delay=0.02),
+            hedge=HedgePolicy(percentile=90, min_samples=20),
+            failure_threshold=10_000,
+        ),
+    }
+
+    print(f"\n{args.calls} calls, concurrency {args.concurrency}, "
+          f"{args.error_rate:.0%} errors, {args.slow_rate:.0%} spikes of {args.slow_latency}s\n")
+    print(f"{'variant':<10} {'success':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'requests':>9}")
+    print("-" * 68)
+
+    for name, build in variants.items():
+        with FaultServer(FaultConfig(slow_rate=0.0, error_rate=0.0, seed=args.seed)) as warmup_server:
+            run_workload(build(warmup_server), args.warmup, args.concurrency)
+        # Fresh server per variant so every variant sees the same fault sequence
+        with FaultServer(faults) as server:
+            stats = run_workload(build(server), args.calls, args.concurrency)
+            print(f"{name:<10} {stats['success_rate']:>8.1%} "
+                  f"{stats['p50'] * 1000:>9.1f} {stats['p95'] * 1000:>9.1f} "
+                  f"{stats['p99'] * 1000:>9.1f} {stats['max'] * 1000:>9.1f} {server.requests:>9}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: thread index queries at a million threads
+====================================================
+Loads `--threads` synthetic index rows (category, last-updated time and
+message count spread over two days) into IndexedCheckpointSaver and times:
+
+- a filtered first page ("billing threads, newest first") and the next page
+- a combined filter (category + time window + message count)
+- streaming every billing thread page by page, with peak Python memory
+- the counts-per-category-per-hour aggregation
+
+For comparison it also times the old way - replaying threads through
+`get_state` on Episode 3's agent - on a small sample of real threads, and
+extrapolates to the full thread count.
+
+    python -m benchmarks.bench_thread_index --threads 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+import tracemalloc
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from benchmarks import load_episode
+from demo_helpers import FakeChatModel
+from thread_index import IndexedCheckpointSaver, ThreadRow
+
+CATEGORIES = ["billing", "technical", "general"]
+TWO_DAYS = 2 * 24 * 3600
+
+
+def synthetic_rows(count: int, now: float, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield ThreadRow(
+            thread_id=f"thread-{i:07d}",
+            checkpoint_id=f"{i:032x}",
+            category=rng.choices(CATEGORIES, weights=[3, 5, 2])[0],
+            updated_at=now - rng.random() * TWO_DAYS,
+            message_count=rng.randint(2, 200),
+        )
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def replay_baseline(sample: int) -> float:
+    """Milliseconds per thread to answer "is it billing?" via get_state."""
+    routing = load_episode("episode-03-conditional-logic/01_conditional_routing.py")
+    fake = FakeChatModel(
+        responder=lambda m: random.choice(CATEGORIES) if "ONE WORD" in m[-1].content else "ok"
+    )
+    agent = routing.create_support_agent(checkpointer=MemorySaver(), llm=fake)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(sample):
+            agent.invoke({"messages": [HumanMessage(content=f"ticket {i}")]},
+                         {"configurable": {"thread_id": f"t{i}"}})
+
+    def replay():
+        return [
+            i for i in range(sample)
+            if agent.get_state({"configurable": {"thread_id": f"t{i}"}}).values["category"] == "billing"
+        ]
+
+    _, ms = timed(replay)
+    return ms / sample
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--replay-sample", type=int, default=200)
+    args = parser.parse_args()
+
+    index = IndexedCheckpointSaver(MemorySaver())
+    now = time.time()
+
+    print(f"\nIndexing {args.threads:,} threads...")
+    rows = synthetic_rows(args.threads, now)
+    _, load_ms = timed(lambda: index.bulk_index(list(rows)))
+    print(f"  loaded in {load_ms / 1000:.1f} s\n")
+
+    print(f"{'query':<48} {'rows':>9} {'ms':>9}")
+    print("-" * 68)
+
+    page, ms = timed(lambda: index.find_threads(category="billing", page_size=100))
+    print(f"{'first page: billing, newest first':<48} {len(page.threads):>9,} {ms:>9.2f}")
+
+    page, ms = timed(lambda: index.find_threads(category="billing", page_size=100, cursor=page.next_cursor))
+    print(f"{'next page (keyset cursor)':<48} {len(page.threads):>9,} {ms:>9.2f}")
+
+    window = dict(category="technical", updated_after=now - 3600, min_messages=100)
+    matches, ms = timed(lambda: sum(1 for _ in index.scan_threads(page_size=args.page_size, **window)))
+    print(f"{'technical, last hour, >= 100 messages':<48} {matches:>9,} {ms:>9.2f}")
+
+    def stream_billing():
+        return sum(1 for _ in index.scan_threads(page_size=args.page_size, category="billing"))
+
+    count, ms = timed(stream_billing)
+    print(f"{'stream ALL billing threads':<48} {count:>9,} {ms:>9.2f}")
+    tracemalloc.start()  # Second pass, only to measure memory (tracing slows it down)
+    stream_billing()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'  peak Python memory while streaming':<48} {'':>9} {peak / 1024:>7.0f}KB")
+
+    buckets, ms = timed(index.counts_per_category_per_hour)
+    print(f"{'counts per category per hour':<48} {len(buckets):>9,} {ms:>9.2f}")
+
+    per_thread_ms = replay_baseline(args.replay_sample)
+    print(f"\nOld way (get_state on every thread): {per_thread_ms:.3f} ms/thread "
+          f"→ ~{per_thread_ms * args.threads / 1000:,.0f} s for {args.threads:,} threads\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: vectorized tools vs scalar tool calls
+================================================
+Two questions:
+
+1. Per-call overhead: an AIMessage with N scalar `multiply` calls, executed
+   by a plain ToolNode (Episode 2's tools) vs BatchedToolNode, which merges
+   them into one NumPy call.
+
+2. Loop iterations: "multiply these N prices by 1.2" when the model emits
+   one scalar call per turn (Episode 2's agent), vs one array call with the
+   vectorized tools. Each iteration is a full agent → tools → agent loop.
+
+    python -m benchmarks.bench_vector_tools --sizes 10,100,1000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph, START, END, MessagesState
+from langgraph.prebuilt import ToolNode
+
+from benchmarks import load_episode
+from demo_helpers import ScriptedModel, tool_call
+from vector_tools import BatchedToolNode, add, multiply
+
+
+def best_of(runs: int, fn) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def tools_only_graph(tool_node):
+    """A one-node graph, so ToolNode gets the runtime config it expects."""
+    graph = StateGraph(MessagesState)
+    graph.add_node("tools", tool_node)
+    graph.add_edge(START, "tools")
+    graph.add_edge("tools", END)
+    return graph.compile()
+
+
+def per_call_overhead(scalar_tools: list, sizes: list[int], runs: int):
+    print("\n1) Executing N scalar multiply calls from one AIMessage")
+    print(f"{'calls':>7} {'ToolNode ms':>12} {'us/call':>9} {'Batched ms':>11} {'us/call':>9} {'speedup':>8}")
+    print("-" * 61)
+    for n in sizes:
+        message = AIMessage(content="", tool_calls=[tool_call("multiply", a=float(i), b=1.2) for i in range(n)])
+        state = {"messages": [HumanMessage(content="go"), message]}
+        plain = tools_only_graph(ToolNode(scalar_tools))
+        batched = tools_only_graph(BatchedToolNode([add, multiply]))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            plain_s = best_of(runs, lambda: plain.invoke(state))
+            batched_s = best_of(runs, lambda: batched.invoke(state))
+
+        print(f"{n:>7} {plain_s * 1000:>12.2f} {plain_s / n * 1e6:>9.1f} "
+              f"{batched_s * 1000:>11.2f} {batched_s / n * 1e6:>9.1f} {plain_s / batched_s:>7.1f}x")
+
+
+def loop_iterations(memory, vectorized, sizes: list[int]):
+    print("\n2) Agent loop: multiply N prices by 1.2")
+    print(f"{'prices':>7} {'scalar iters':>13} {'scalar ms':>10} {'vector iters':>13} {'vector ms':>10} {'saved':>7}")
+    print("-" * 66)
+    for n in sizes:
+        prices = [float(i) + 0.5 for i in range(n)]
+        question = {"messages": [HumanMessage(content="Multiply every price by 1.2")]}
+
+        # Scalar tools, one call per turn: N tool rounds + a final answer
+        script = [AIMessage(content="", tool_calls=[tool_call("multiply", a=p, b=1.2)]) for p in prices]
+        scalar_agent = memory.create_agent_with_memory(
+            llm=ScriptedModel(messages=iter(script + [AIMessage(content="done")]))
+        )
+        # Vectorized tools: one array call + a final answer
+        vector_agent = vectorized.create_vectorized_agent(ScriptedModel(messages=iter([
+            AIMessage(content="", tool_calls=[tool_call("multiply", a=prices, b=1.2)]),
+            AIMessage(content="done"),
+        ])))
+
+        results = {}
+        for name, agent in (("scalar", scalar_agent), ("vector", vector_agent)):
+            config = {"configurable": {"thread_id": name}, "recursion_limit": 2 * n + 10}
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                out = agent.invoke(question, config)
+                elapsed = time.perf_counter() - start
+            iterations = sum(isinstance(m, AIMessage) for m in out["messages"])
+            results[name] = (iterations, elapsed)
+
+        (s_iters, s_time), (v_iters, v_time) = results["scalar"], results["vector"]
+        print(f"{n:>7} {s_iters:>13} {s_time * 1000:>10.1f} {v_iters:>13} {v_time * 1000:>10.1f} "
+              f"{s_iters - v_iters:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,1000", help="comma-separated numbers of calls/prices")
+    parser.add_argument("--runs", type=int, default=3, help="repeat each timing, keep the best")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    memory = load_episode("episode-02-memory-and-state/01_agent_with_memory.py")
+    vectorized = load_episode("episode-06-production-patterns/03_vectorized_tools.py")
+
+    per_call_overhead([memory.add, memory.multiply], sizes, args.runs)
+    loop_iterations(memory, vectorized, sizes)
+    print()
+
+
+if __name__ == "__main__":
+    main()
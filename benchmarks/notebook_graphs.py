@@ -0,0 +1,71 @@
+"""
+The parallel and reducer graphs from the Episode 4 & 5 notebook
+(langgraph_concepts_deep_dive.ipynb), rebuilt as functions so the
+benchmarks can compile them. Same nodes and edges, minus the prints.
+"""
+
+from operator import add
+from typing import Annotated
+from typing_extensions import TypedDict
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage
+from langgraph.graph import StateGraph, START, END
+from langgraph.graph.message import add_messages
+
+
+# Parallel execution: two nodes in the same super-step
+# -----------------------------------------------------
+class ParallelState(TypedDict):
+    value: Annotated[int, add]
+
+
+def create_parallel_graph(checkpointer=None):
+    """START → start_node → (parallel_1, parallel_2) → END"""
+    graph = StateGraph(ParallelState)
+    graph.add_node("start_node", lambda state: {"value": state["value"] + 1})
+    graph.add_node("parallel_1", lambda state: {"value": state["value"] * 2})
+    graph.add_node("parallel_2", lambda state: {"value": state["value"] + 10})
+
+    graph.add_edge(START, "start_node")
+    graph.add_edge("start_node", "parallel_1")
+    graph.add_edge("start_node", "parallel_2")
+    graph.add_edge("parallel_1", END)
+    graph.add_edge("parallel_2", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+# Addition reducer: counters and concatenated lists
+# --------------------------------------------------
+class StateWithAddition(TypedDict):
+    counter: Annotated[int, add]
+    items: Annotated[list[str], add]
+
+
+def create_addition_graph(checkpointer=None):
+    """START → increment → add_more → END"""
+    graph = StateGraph(StateWithAddition)
+    graph.add_node("increment", lambda state: {"counter": 5, "items": ["apple"]})
+    graph.add_node("add_more", lambda state: {"counter": 3, "items": ["banana", "cherry"]})
+
+    graph.add_edge(START, "increment")
+    graph.add_edge("increment", "add_more")
+    graph.add_edge("add_more", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+# add_messages reducer: a two-node conversation
+# ----------------------------------------------
+class ConversationState(TypedDict):
+    messages: Annotated[list[AnyMessage], add_messages]
+
+
+def create_conversation_graph(checkpointer=None):
+    """START → user → ai → END"""
+    graph = StateGraph(ConversationState)
+    graph.add_node("user", lambda state: {"messages": [HumanMessage(content="Hello!")]})
+    graph.add_node("ai", lambda state: {"messages": [AIMessage(content="Hi there! How can I help?")]})
+
+    graph.add_edge(START, "user")
+    graph.add_edge("user", "ai")
+    graph.add_edge("ai", END)
+    return graph.compile(checkpointer=checkpointer)
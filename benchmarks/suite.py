@@ -0,0 +1,430 @@
+"""
+Benchmark suite: every episode graph, one JSON report
+=====================================================
+Runs each episode graph with instant fake models across:
+
+- conversation lengths (turns per thread)
+- concurrency levels (threads invoked in parallel)
+- checkpointer backends (MemorySaver, DeltaCheckpointSaver,
+  IndexedCheckpointSaver) for the graphs that keep state
+
+and records, per case: invoke latency (mean/p50/p95/p99), latency of the
+last turn, throughput, retained memory per thread and checkpoint bytes per
+thread. The suite runs `--repeat` rounds over every case; the JSON holds
+each metric's median and every round's value. `compare` diffs two result files and exits with status 1 if
+anything got worse.
+
+    python -m benchmarks.suite run --out baseline.json
+    python -m benchmarks.suite run --quick --only ep02,ep03 --out new.json
+    python -m benchmarks.suite compare baseline.json new.json
+
+Checkpoint bytes are deterministic and use `--threshold`. Timings and
+traced memory are noisy: they use the looser `--time-threshold`, AND the
+repeats of the two runs must not overlap (e.g. every new p50 is above every
+old one) before a change counts. Compare from the same, otherwise idle machine.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib.metadata import version
+from typing import Any, Callable, Optional
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from benchmarks import load_episode, notebook_graphs
+from benchmarks.bench_checkpoint_delta import stored_bytes
+from demo_helpers import FakeChatModel, support_responder, tool_round_trip
+from delta_checkpoint import DeltaCheckpointSaver
+from thread_index import IndexedCheckpointSaver
+
+SCHEMA_VERSION = 2
+
+
+# Step 1: The Graphs
+# -------------------
+@dataclass
+class Scenario:
+    """One episode graph, and how to hold a conversation with it"""
+    name: str
+    build: Callable[[Any], Any]  # checkpointer (or None) -> compiled graph
+    next_input: Callable[[Optional[dict], int], dict]  # (previous output, turn) -> input
+    checkpointed: bool  # Run once per checkpointer backend (otherwise without one)
+    conversational: bool = True  # False: state doesn't grow, so only length 1 is run
+
+
+def ask(previous: Optional[dict], turn: int) -> dict:
+    """Next user message; the checkpointer remembers the rest."""
+    return {"messages": [HumanMessage(content=f"Message {turn}: what is 12 times 7?")]}
+
+
+def resend_history(previous: Optional[dict], turn: int) -> dict:
+    """No checkpointer: the client sends the whole history every turn."""
+    history = previous["messages"] if previous else []
+    return {"messages": history + ask(previous, turn)["messages"]}
+
+
+def scenarios() -> list[Scenario]:
+    simple = load_episode("episode-01-langgraph-basics/01_simple_agent.py")
+    with_tool = load_episode("episode-01-langgraph-basics/02_agent_with_tool.py")
+    memory = load_episode("episode-02-memory-and-state/01_agent_with_memory.py")
+    routing = load_episode("episode-03-conditional-logic/01_conditional_routing.py")
+
+    with_tool.ChatAnthropic = lambda **kwargs: FakeChatModel(responder=tool_round_trip())
+    support_llm = FakeChatModel(responder=support_responder())
+
+    return [
+        Scenario("ep01_simple_agent", lambda cp: simple.create_simple_agent(),
+                 lambda previous, turn: {"message": "Hi there!"}, checkpointed=False, conversational=False),
+        Scenario("ep01_agent_with_tool", lambda cp: with_tool.create_agent(),
+                 resend_history, checkpointed=False),
+        Scenario("ep02_agent_with_memory", lambda cp: memory.create_agent_with_memory(
+            llm=FakeChatModel(responder=tool_round_trip()), checkpointer=cp), ask, checkpointed=True),
+        Scenario("ep03_support_agent", lambda cp: routing.create_support_agent(checkpointer=cp, llm=support_llm),
+                 ask, checkpointed=True),
+        Scenario("ep03_support_agent_multi_label", lambda cp: routing.create_support_agent(
+            multi_label=True, checkpointer=cp, llm=support_llm), ask, checkpointed=True),
+        Scenario("nb_parallel", notebook_graphs.create_parallel_graph,
+                 lambda previous, turn: {"value": 5}, checkpointed=False, conversational=False),
+        Scenario("nb_addition_reducer", notebook_graphs.create_addition_graph,
+                 lambda previous, turn: {"counter": 10, "items": ["orange"]},
+                 checkpointed=False, conversational=False),
+        Scenario("nb_add_messages", notebook_graphs.create_conversation_graph,
+                 lambda previous, turn: {"messages": []}, checkpointed=True),
+    ]
+
+
+# Step 2: The Checkpointer Backends
+# ----------------------------------
+BACKENDS = {
+    "memory": MemorySaver,
+    "delta": DeltaCheckpointSaver,
+    "indexed": lambda: IndexedCheckpointSaver(MemorySaver()),
+}
+
+
+def new_saver(backend: str):
+    return None if backend == "none" else BACKENDS[backend]()
+
+
+def checkpoint_bytes(saver) -> int:
+    if saver is None:
+        return 0
+    if isinstance(saver, IndexedCheckpointSaver):
+        return stored_bytes(saver.saver) + saver.index_bytes()
+    return stored_bytes(saver)
+
+
+# Step 3: Measuring One Case
+# ---------------------------
+def run_conversation(graph, scenario: Scenario, thread_id: str, length: int) -> list[float]:
+    """Seconds per invoke for `length` turns on one thread."""
+    config = {"configurable": {"thread_id": thread_id}}
+    previous, timings = None, []
+    for turn in range(length):
+        inputs = scenario.next_input(previous, turn)
+        start = time.perf_counter()
+        previous = graph.invoke(inputs, config)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def warm_up(graph, scenario: Scenario) -> None:
+    for i in range(5):
+        run_conversation(graph, scenario, f"warmup-{i}", 1)
+
+
+def median_of(runs: list[dict]) -> dict:
+    """
+    Median of each metric over repeated runs, plus every run's value under
+    "repeats" (e.g. {"latency_ms.p50": [...]}) so `compare` can see the spread.
+    """
+    def merge(values: list) -> Any:
+        if isinstance(values[0], dict):
+            return {key: merge([value[key] for value in values]) for key in values[0]}
+        return statistics.median(values)
+
+    def flatten(run: dict, prefix: str = "") -> dict:
+        flat = {}
+        for key, value in run.items():
+            if isinstance(value, dict):
+                flat.update(flatten(value, f"{prefix}{key}."))
+            else:
+                flat[prefix + key] = value
+        return flat
+
+    flat_runs = [flatten(run) for run in runs]
+    return {
+        **merge(runs),
+        "repeats": {path: [run[path] for run in flat_runs] for path in flat_runs[0]},
+    }
+
+
+def measure_timing(scenario: Scenario, backend: str, length: int, concurrency: int, threads: int) -> dict:
+    """One timed run on a fresh graph and checkpointer."""
+    graph = scenario.build(new_saver(backend))
+    warm_up(graph, scenario)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        conversations = list(pool.map(
+            lambda i: run_conversation(graph, scenario, f"thread-{i}", length), range(threads)
+        ))
+        wall = time.perf_counter() - start
+
+    ms = [t * 1000 for conversation in conversations for t in conversation]
+    return {
+        "latency_ms": {
+            "mean": statistics.mean(ms),
+            "p50": percentile(ms, 0.50),
+            "p95": percentile(ms, 0.95),
+            "p99": percentile(ms, 0.99),
+        },
+        "last_turn_ms": statistics.mean(conversation[-1] * 1000 for conversation in conversations),
+        "throughput_per_s": len(ms) / wall,
+    }
+
+
+def measure_memory(scenario: Scenario, backend: str, length: int, threads: int) -> dict:
+    """Memory the graph holds on to per thread, in a separate (traced, slower) pass."""
+    saver = new_saver(backend)
+    graph = scenario.build(saver)
+    warm_up(graph, scenario)
+    bytes_before = checkpoint_bytes(saver)
+
+    tracemalloc.start()
+    traced_before, _ = tracemalloc.get_traced_memory()
+    for i in range(threads):
+        run_conversation(graph, scenario, f"thread-{i}", length)
+    traced_after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "memory_per_thread_kb": (traced_after - traced_before) / threads / 1024,
+        "checkpoint_bytes_per_thread": (checkpoint_bytes(saver) - bytes_before) / threads,
+    }
+
+
+# Step 4: Running the Suite
+# --------------------------
+def run_suite(args) -> dict:
+    lengths = [int(n) for n in args.lengths.split(",")]
+    concurrency_levels = [int(n) for n in args.concurrency.split(",")]
+    only = args.only.split(",") if args.only else None
+
+    # (scenario, backend, length, threads) -> the concurrency levels to time
+    cases = []
+    for scenario in scenarios():
+        if only and not any(scenario.name.startswith(prefix) for prefix in only):
+            continue
+        for backend in (list(BACKENDS) if scenario.checkpointed else ["none"]):
+            for length in (lengths if scenario.conversational else [1]):
+                threads = max(args.threads, math.ceil(args.min_invokes / length))
+                cases.append((scenario, backend, length, threads))
+
+    # Repeats go round the whole suite, not back to back: a slow minute on the
+    # machine then lands in one repeat of many cases, not every repeat of one
+    memory_runs, timing_runs = defaultdict(list), defaultdict(list)
+    for round_number in range(args.repeat):
+        print(f"  Round {round_number + 1}/{args.repeat}...")
+        for scenario, backend, length, threads in cases:
+            with contextlib.redirect_stdout(io.StringIO()):  # The episodes print as they go
+                memory_runs[(scenario.name, backend, length)].append(
+                    measure_memory(scenario, backend, length, min(threads, args.memory_threads))
+                )
+                for concurrency in concurrency_levels:
+                    timing_runs[(scenario.name, backend, length, concurrency)].append(
+                        measure_timing(scenario, backend, length, concurrency, threads)
+                    )
+
+    print(f"\n{'case':<58} {'invokes':>8} {'p50 ms':>8} {'p95 ms':>8} {'ops/s':>9} "
+          f"{'KB/thread':>10} {'ckpt B/thread':>14}")
+    print("-" * 121)
+
+    results = []
+    for scenario, backend, length, threads in cases:
+        memory = median_of(memory_runs[(scenario.name, backend, length)])
+        for concurrency in concurrency_levels:
+            timing = median_of(timing_runs[(scenario.name, backend, length, concurrency)])
+            case = {
+                "id": f"{scenario.name}/{backend}/len={length}/conc={concurrency}",
+                "graph": scenario.name,
+                "checkpointer": backend,
+                "length": length,
+                "concurrency": concurrency,
+                "threads": threads,
+                "invokes": threads * length,
+                **timing,
+                **memory,
+                "repeats": {**timing["repeats"], **memory["repeats"]},
+            }
+            results.append(case)
+            print(f"{case['id']:<58} {case['invokes']:>8} {case['latency_ms']['p50']:>8.3f} "
+                  f"{case['latency_ms']['p95']:>8.3f} {case['throughput_per_s']:>9.1f} "
+                  f"{case['memory_per_thread_kb']:>10.1f} {case['checkpoint_bytes_per_thread']:>14,.0f}")
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "langgraph": version("langgraph"),
+            "langchain_core": version("langchain-core"),
+        },
+        "settings": {
+            "lengths": lengths,
+            "concurrency": concurrency_levels,
+            "threads": args.threads,
+            "min_invokes": args.min_invokes,
+            "repeat": args.repeat,
+            "memory_threads": args.memory_threads,
+        },
+        "results": results,
+    }
+
+
+# Step 5: Comparing Two Runs
+# ---------------------------
+# metric -> (higher is better, is noisy, changes smaller than this are noise)
+# Noisy metrics vary between identical runs: timings, and tracemalloc's view
+# of memory (caches, interning and GC timing all move it).
+METRICS = {
+    "latency_ms.p50": (False, True, 0.05),
+    "latency_ms.p95": (False, True, 0.1),
+    "throughput_per_s": (True, True, 1.0),
+    "memory_per_thread_kb": (False, True, 1.0),
+    "checkpoint_bytes_per_thread": (False, False, 64),
+}
+
+
+def metric(case: dict, path: str) -> float:
+    value = case
+    for key in path.split("."):
+        value = value[key]
+    return value
+
+
+def spread(case: dict, path: str) -> tuple[float, float]:
+    """Lowest and highest value over the case's repeats (older files: just the value)."""
+    values = case.get("repeats", {}).get(path) or [metric(case, path)]
+    return min(values), max(values)
+
+
+def compare(base: dict, new: dict, threshold: float, time_threshold: float) -> list[dict]:
+    """
+    Every metric that moved more than its threshold, with `regression` set
+    if it got worse. Noisy metrics compare medians, and only count when the
+    two runs' repeats don't overlap at all.
+    """
+    base_cases = {case["id"]: case for case in base["results"]}
+    changes = []
+    for case in new["results"]:
+        old = base_cases.get(case["id"])
+        if old is None:
+            continue
+        for path, (higher_is_better, is_noisy, noise) in METRICS.items():
+            before, after = metric(old, path), metric(case, path)
+            if abs(after - before) < noise:
+                continue
+            change = (after - before) / abs(before) if before else math.inf
+            if abs(change) <= (time_threshold if is_noisy else threshold):
+                continue
+            if is_noisy:
+                (old_low, old_high), (new_low, new_high) = spread(old, path), spread(case, path)
+                if new_low <= old_high and old_low <= new_high:
+                    continue  # Within the spread of the repeats
+            worse = change < 0 if higher_is_better else change > 0
+            changes.append({
+                "id": case["id"], "metric": path, "base": before, "new": after,
+                "change": change, "regression": worse,
+            })
+    return changes
+
+
+def print_comparison(base: dict, new: dict, changes: list[dict], threshold: float, time_threshold: float) -> None:
+    if base["environment"] != new["environment"]:
+        print("\n⚠️  The runs come from different environments:")
+        for key in base["environment"]:
+            if base["environment"][key] != new["environment"].get(key):
+                print(f"   {key}: {base['environment'][key]} → {new['environment'].get(key)}")
+
+    base_ids = {case["id"] for case in base["results"]}
+    new_ids = {case["id"] for case in new["results"]}
+    print(f"\nCompared {len(base_ids & new_ids)} cases "
+          f"({len(base_ids - new_ids)} only in base, {len(new_ids - base_ids)} only in new), "
+          f"thresholds: checkpoint bytes {threshold:.0%}, timings and memory {time_threshold:.0%} "
+          f"(and outside the spread of the repeats)\n")
+
+    if not changes:
+        print("✅ No changes beyond the threshold\n")
+        return
+    print(f"{'':<3}{'case':<58} {'metric':<28} {'base':>12} {'new':>12} {'change':>9}")
+    print("-" * 125)
+    for c in sorted(changes, key=lambda c: (not c["regression"], c["id"], c["metric"])):
+        flag = "❌" if c["regression"] else "✅"
+        print(f"{flag:<3}{c['id']:<58} {c['metric']:<28} {c['base']:>12.3f} {c['new']:>12.3f} {c['change']:>+9.1%}")
+    regressions = sum(c["regression"] for c in changes)
+    print(f"\n{regressions} regression(s), {len(changes) - regressions} improvement(s)\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite and write JSON results")
+    run.add_argument("--out", default="benchmark-results.json")
+    run.add_argument("--lengths", default="1,10,50", help="comma-separated turns per thread")
+    run.add_argument("--concurrency", default="1,8", help="comma-separated parallel threads")
+    run.add_argument("--threads", type=int, default=8, help="threads (conversations) per case")
+    run.add_argument("--min-invokes", type=int, default=100, help="add threads until a case has this many invokes")
+    run.add_argument("--repeat", type=int, default=5, help="rounds over every case; medians are reported")
+    run.add_argument("--memory-threads", type=int, default=4, help="threads in the traced memory pass")
+    run.add_argument("--only", help="comma-separated graph name prefixes, e.g. ep02,nb_")
+    run.add_argument("--quick", action="store_true", help="small settings for a fast check")
+
+    diff = commands.add_parser("compare", help="compare two result files and flag regressions")
+    diff.add_argument("base")
+    diff.add_argument("new")
+    diff.add_argument("--threshold", type=float, default=0.05,
+                      help="relative change in checkpoint bytes that counts (0.05 = 5%%)")
+    diff.add_argument("--time-threshold", type=float, default=0.25,
+                      help="relative change in timings and memory that counts")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if args.quick:
+            args.lengths, args.concurrency, args.threads, args.min_invokes = "1,10", "1,4", 4, 40
+        report = run_suite(args)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ {len(report['results'])} cases written to {args.out}\n")
+    else:
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        changes = compare(base, new, args.threshold, args.time_threshold)
+        print_comparison(base, new, changes, args.threshold, args.time_threshold)
+        sys.exit(1 if any(c["regression"] for c in changes) else 0)
+
+
+if __name__ == "__main__":
+    main()
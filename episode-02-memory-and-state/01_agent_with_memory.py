@@ -70,14 +70,21 @@ class AgentState(TypedDict):
 
 # Step 3: Create Agent with Memory
 # ----------------------------------
-def create_agent_with_memory():
+def create_agent_with_memory(llm=None, checkpointer=None):
     """
     Creates an agent that REMEMBERS conversations!
 
     The key difference: We add a checkpointer that saves state.
+
+    Pass your own `llm` to swap the model (e.g. one wrapped in Episode 6's
+    ResilientChatModel). Defaults to Claude.
+
+    Pass your own `checkpointer` to change where state is saved
+    (e.g. Episode 6's DeltaCheckpointSaver). Defaults to MemorySaver.
     """
     # Initialize LLM with tools
-    llm = ChatAnthropic(model="claude-sonnet-4-5")
+    if llm is None:
+        llm = ChatAnthropic(model="claude-sonnet-4-5")
     llm_with_tools = llm.bind_tools([add, multiply])
 
     # Define the agent node
@@ -115,7 +122,8 @@ def create_agent_with_memory():
 
     # THE MAGIC: Add a checkpointer to save state!
     # MemorySaver stores conversation history in memory
-    checkpointer = MemorySaver()
+    if checkpointer is None:
+        checkpointer = MemorySaver()
 
     # Compile with the checkpointer
     return graph.compile(checkpointer=checkpointer)
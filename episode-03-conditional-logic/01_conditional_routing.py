@@ -12,13 +12,15 @@ Key Concepts:
 - Multiple paths: Different flows based on conditions
 """
 
+import json
 import os
-from typing import Annotated, Literal
+from functools import partial
+from typing import Annotated, Literal, Optional
 from typing_extensions import TypedDict
 
 from dotenv import load_dotenv
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
@@ -27,20 +29,38 @@ from langgraph.checkpoint.memory import MemorySaver
 
 # Step 1: Define State
 # ---------------------
+def merge_specialist_replies(current: dict, update: Optional[dict]) -> dict:
+    """
+    Reducer for replies from specialists running in parallel.
+
+    Each specialist returns {category: reply}; the dicts are merged so no
+    reply overwrites another. An update of None clears the replies, which
+    the categorizer does at the start of every turn.
+    """
+    if update is None:
+        return {}
+    return {**(current or {}), **update}
+
+
 class SupportState(TypedDict):
     """State for our customer support agent"""
     messages: Annotated[list, add_messages]
     category: str  # Will store: "billing", "technical", or "general"
 
+    # Only used in multi-label mode (see create_support_agent)
+    categories: list[str]  # Every category relevant enough to get a specialist
+    specialist_replies: Annotated[dict, merge_specialist_replies]
+
 
 # Step 2: Categorization Node
 # ----------------------------
-def categorize_request(state: SupportState) -> SupportState:
+def categorize_request(state: SupportState, llm=None) -> SupportState:
     """
     Analyzes the user's message and categorizes it.
     This is our decision-making node.
     """
-    llm = ChatAnthropic(model="claude-sonnet-4-5")
+    if llm is None:
+        llm = ChatAnthropic(model="claude-sonnet-4-5")
 
     # Get the user's last message
     user_message = state["messages"][-1].content
@@ -65,11 +85,76 @@ def categorize_request(state: SupportState) -> SupportState:
     return {"category": category}
 
 
+# Step 2b: Multi-Label Categorization
+# ------------------------------------
+# Some tickets are BOTH billing and technical ("I was charged twice because
+# the app crashed during checkout"). Instead of picking one category, we ask
+# the LLM how relevant each category is.
+SPECIALIST_CATEGORIES = ["billing", "technical", "general"]
+
+
+def score_categories(state: SupportState, llm=None) -> dict[str, float]:
+    """Ask the LLM for a 0-1 relevance score per category."""
+    if llm is None:
+        llm = ChatAnthropic(model="claude-sonnet-4-5")
+
+    user_message = state["messages"][-1].content
+
+    scoring_prompt = f"""
+    You are a customer support router. Rate how relevant each category is
+    to this request, from 0.0 (not at all) to 1.0 (definitely):
+    - "billing" (payments, invoices, refunds, pricing)
+    - "technical" (bugs, errors, how-to questions, features)
+    - "general" (greetings, general questions, other)
+
+    User message: {user_message}
+
+    Respond with ONLY a JSON object, e.g. {{"billing": 0.9, "technical": 0.6, "general": 0.1}}
+    """
+
+    response = llm.invoke([HumanMessage(content=scoring_prompt)])
+    return parse_scores(response.content)
+
+
+def parse_scores(text) -> dict[str, float]:
+    """
+    Turn the LLM's reply into a score per category. Tolerates Markdown code
+    fences; anything unusable scores 0.0 (with a warning) instead of crashing.
+    """
+    if isinstance(text, list):  # Content blocks, e.g. [{"type": "text", "text": "..."}]
+        text = "".join(b.get("text", "") if isinstance(b, dict) else str(b) for b in text)
+    text = str(text).strip()
+    if text.startswith("```"):
+        # ```json\n{...}\n``` → {...}
+        text = text.split("\n", 1)[1] if "\n" in text else text.strip("`")
+        text = text.rsplit("```", 1)[0].strip()
+
+    try:
+        scores = json.loads(text)
+    except json.JSONDecodeError:
+        print(f"  ⚠️  Scores weren't valid JSON, falling back to general: {text[:60]!r}")
+        scores = {}
+    if not isinstance(scores, dict):
+        print(f"  ⚠️  Expected a JSON object of scores, got {type(scores).__name__}")
+        scores = {}
+
+    parsed = {}
+    for category in SPECIALIST_CATEGORIES:
+        value = scores.get(category, 0.0)
+        try:
+            parsed[category] = float(value)
+        except (TypeError, ValueError):
+            print(f"  ⚠️  Ignoring non-numeric score for {category}: {value!r}")
+            parsed[category] = 0.0
+    return parsed
+
+
 # Step 3: Specialist Nodes
 # -------------------------
-def billing_specialist(state: SupportState) -> SupportState:
+def billing_specialist(state: SupportState, llm=None) -> SupportState:
     """Handles billing-related questions"""
-    llm = ChatAnthropic(model="claude-sonnet-4-5")
+    if llm is None:
+        llm = ChatAnthropic(model="claude-sonnet-4-5")
 
     system_message = SystemMessage(
         content="You are a billing specialist. Help with payments, invoices, refunds, and pricing questions. Be professional and helpful."
@@ -81,9 +166,10 @@ def billing_specialist(state: SupportState) -> SupportState:
     return {"messages": [response]}
 
 
-def technical_specialist(state: SupportState) -> SupportState:
+def technical_specialist(state: SupportState, llm=None) -> SupportState:
     """Handles technical questions"""
-    llm = ChatAnthropic(model="claude-sonnet-4-5")
+    if llm is None:
+        llm = ChatAnthropic(model="claude-sonnet-4-5")
 
     system_message = SystemMessage(
         content="You are a technical support specialist. Help with bugs, errors, how-to questions, and feature explanations. Be technical but clear."
@@ -95,9 +181,10 @@ def technical_specialist(state: SupportState) -> SupportState:
     return {"messages": [response]}
 
 
-def general_support(state: SupportState) -> SupportState:
+def general_support(state: SupportState, llm=None) -> SupportState:
     """Handles general questions"""
-    llm = ChatAnthropic(model="claude-sonnet-4-5")
+    if llm is None:
+        llm = ChatAnthropic(model="claude-sonnet-4-5")
 
     system_message = SystemMessage(
         content="You are a friendly general support agent. Handle greetings, general questions, and route to specialists if needed."
@@ -129,22 +216,88 @@ def route_to_specialist(state: SupportState) -> Literal["billing", "technical",
         return "general"
 
 
+def route_to_specialists(state: SupportState) -> list[str]:
+    """
+    Multi-label router: returns a LIST of node names.
+
+    LangGraph runs every node in the list in the same super-step,
+    so the specialists answer in parallel (like parallel_1/parallel_2
+    in the Episode 4 & 5 notebook).
+    """
+    categories = state["categories"]
+    print(f"  🔀 Fanning out to: {', '.join(categories)}")
+    return categories
+
+
+# Step 4b: Parallel Specialists and the Merge Node
+# ------------------------------------------------
+def as_parallel_specialist(category: str, specialist):
+    """
+    Wrap a specialist so its reply goes into `specialist_replies` instead of
+    `messages`. The merge node turns all replies into ONE answer.
+    """
+    def parallel_specialist(state: SupportState) -> SupportState:
+        reply = specialist(state)["messages"][-1]
+        return {"specialist_replies": {category: reply.content}}
+
+    return parallel_specialist
+
+
+def merge_replies(state: SupportState) -> SupportState:
+    """Fan-in: combine the specialists' replies into a single message."""
+    replies = state["specialist_replies"]
+    categories = [c for c in state["categories"] if c in replies]
+
+    if len(categories) == 1:
+        content = replies[categories[0]]
+    else:
+        content = "\n\n".join(
+            f"**{category.title()}:** {replies[category]}" for category in categories
+        )
+
+    print(f"  🧩 Merged replies from {len(categories)} specialist(s)")
+    return {"messages": [AIMessage(content=content)]}
+
+
 # Step 5: Build the Graph with Conditional Edges
 # -----------------------------------------------
-def create_support_agent():
+def create_support_agent(
+    multi_label: bool = False,
+    relevance_threshold: float = 0.5,
+    max_fan_out: int = 2,
+    checkpointer=None,
+    llm=None,
+):
     """
     Creates a customer support agent with conditional routing.
 
     Flow:
     START → categorize → [billing|technical|general] → END
+
+    With multi_label=True, every specialist whose relevance score is at
+    least `relevance_threshold` answers in parallel (at most `max_fan_out`
+    of them), and their replies are merged:
+    START → categorize → [billing & technical & ...] → merge → END
+
+    Pass your own `checkpointer` to change where state is saved.
+    Defaults to MemorySaver.
+
+    Pass your own `llm` to swap the model used by every node (e.g. one
+    wrapped in Episode 6's ResilientChatModel). Defaults to Claude.
     """
+    if checkpointer is None:
+        checkpointer = MemorySaver()
+
+    if multi_label:
+        return _create_multi_label_support_agent(relevance_threshold, max_fan_out, checkpointer, llm)
+
     graph = StateGraph(SupportState)
 
-    # Add all nodes
-    graph.add_node("categorize", categorize_request)
-    graph.add_node("billing", billing_specialist)
-    graph.add_node("technical", technical_specialist)
-    graph.add_node("general", general_support)
+    # Add all nodes (each one gets the same model)
+    graph.add_node("categorize", partial(categorize_request, llm=llm))
+    graph.add_node("billing", partial(billing_specialist, llm=llm))
+    graph.add_node("technical", partial(technical_specialist, llm=llm))
+    graph.add_node("general", partial(general_support, llm=llm))
 
     # Define the flow
     graph.add_edge(START, "categorize")
@@ -167,7 +320,47 @@ def create_support_agent():
     graph.add_edge("general", END)
 
     # Add memory
-    checkpointer = MemorySaver()
+    return graph.compile(checkpointer=checkpointer)
+
+
+def _create_multi_label_support_agent(relevance_threshold: float, max_fan_out: int, checkpointer, llm=None):
+    """Fan-out/fan-in version of the support agent (see create_support_agent)."""
+    specialists = {
+        "billing": partial(billing_specialist, llm=llm),
+        "technical": partial(technical_specialist, llm=llm),
+        "general": partial(general_support, llm=llm),
+    }
+
+    def categorize_multi_label(state: SupportState) -> SupportState:
+        scores = score_categories(state, llm)
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        relevant = [c for c in ranked if scores[c] >= relevance_threshold]
+        # Cap the fan-out width; fall back to the best match (or general)
+        categories = relevant[:max_fan_out] or [ranked[0] if scores[ranked[0]] > 0 else "general"]
+
+        print(f"  🔍 Scores: {scores} → {categories}")
+        return {
+            "category": categories[0],
+            "categories": categories,
+            "specialist_replies": None,  # Clear last turn's replies
+        }
+
+    graph = StateGraph(SupportState)
+
+    graph.add_node("categorize", categorize_multi_label)
+    for category, specialist in specialists.items():
+        graph.add_node(category, as_parallel_specialist(category, specialist))
+    graph.add_node("merge", merge_replies)
+
+    graph.add_edge(START, "categorize")
+
+    # Fan-out: the router returns a list, all listed specialists run in one super-step
+    graph.add_conditional_edges("categorize", route_to_specialists, list(specialists))
+
+    # Fan-in: merge runs once, in the super-step after the specialists finish
+    for category in specialists:
+        graph.add_edge(category, "merge")
+    graph.add_edge("merge", END)
 
     return graph.compile(checkpointer=checkpointer)
 
@@ -218,10 +411,22 @@ if __name__ == "__main__":
     )
     print(f"🤖 Agent: {result['messages'][-1].content}\n")
 
+    # Test 4: A ticket that is BOTH billing and technical
+    print("\nTest 4: Billing AND Technical Question (multi-label mode)")
+    print("-" * 70)
+    multi_agent = create_support_agent(multi_label=True)
+    print("👤 User: The app crashed during checkout and I was charged twice")
+    result = multi_agent.invoke(
+        {"messages": [HumanMessage(content="The app crashed during checkout and I was charged twice")]},
+        config={"configurable": {"thread_id": "support-demo-multi"}}
+    )
+    print(f"🤖 Agent: {result['messages'][-1].content}\n")
+
     print("=" * 70)
     print("✨ Notice how the agent:")
     print("   1. Categorizes each request")
     print("   2. Routes to the appropriate specialist")
     print("   3. Different specialists have different expertise")
     print("   4. All happens automatically based on state!")
+    print("   5. In multi-label mode, several specialists answer in parallel")
     print("=" * 70 + "\n")
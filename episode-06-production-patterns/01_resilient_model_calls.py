@@ -0,0 +1,132 @@
+"""
+Episode 6: Production Patterns - Part 1
+=======================================
+Resilient Model Calls
+
+In Episodes 1-3, every node called `llm.invoke(...)` and hoped for the best.
+In production, model APIs are sometimes slow and sometimes fail. One slow
+response stalls the whole graph run.
+
+This script shows how a node opts into the resilience layer (resilience.py):
+- Deadlines: set once in the run config, respected by every model call
+- Retries: transient errors (503, timeouts) are retried with jittered backoff
+- Hedging: if a call is slower than usual, a duplicate request races it
+- Circuit breaker: a broken model fails fast instead of timing out again and again
+
+No API key needed - we use a local fake server that injects faults.
+"""
+
+from typing import Annotated
+from typing_extensions import TypedDict
+
+from langchain_core.messages import HumanMessage
+
+from langgraph.graph import StateGraph, START, END
+from langgraph.graph.message import add_messages
+from langgraph.checkpoint.memory import MemorySaver
+
+from fault_server import FaultConfig, FaultServer, FaultServerChatModel
+from resilience import (
+    CircuitOpenError,
+    DeadlineExceeded,
+    HedgePolicy,
+    ResilientChatModel,
+    RetryPolicy,
+    with_deadline,
+)
+
+
+# Step 1: Define State (Same as Episode 2)
+# -----------------------------------------
+class AgentState(TypedDict):
+    """State that tracks conversation messages"""
+    messages: Annotated[list, add_messages]
+
+
+# Step 2: Build an Agent whose Model Node Opts In
+# ------------------------------------------------
+def create_resilient_agent(llm):
+    """
+    Same shape as Episode 2's agent, but the model is wrapped.
+
+    The node itself doesn't change at all: `llm.invoke(...)` picks up the
+    deadline from the graph-run config automatically.
+    """
+    def agent_node(state: AgentState) -> AgentState:
+        response = llm.invoke(state["messages"])
+        return {"messages": [response]}
+
+    graph = StateGraph(AgentState)
+    graph.add_node("agent", agent_node)
+    graph.add_edge(START, "agent")
+    graph.add_edge("agent", END)
+
+    return graph.compile(checkpointer=MemorySaver())
+
+
+# Step 3: Run It Against a Misbehaving Server
+# --------------------------------------------
+if __name__ == "__main__":
+    print("\n" + "=" * 70)
+    print("🛡️  Resilient Model Calls - Retries, Hedging, Circuit Breaker")
+    print("=" * 70 + "\n")
+
+    faults = FaultConfig(error_rate=0.2, slow_rate=0.1, slow_latency=1.0, seed=7)
+
+    with FaultServer(faults) as server:
+        llm = ResilientChatModel(
+            FaultServerChatModel(url=server.url, model="demo-model"),
+            retry=RetryPolicy(max_attempts=4, base_delay=0.05),
+            hedge=HedgePolicy(percentile=90, min_samples=10),
+            attempt_timeout=2.0,
+        )
+        agent = create_resilient_agent(llm)
+
+        # Test 1: Many turns against a flaky server
+        print("Test 1: 30 turns with 20% errors and 10% latency spikes")
+        print("-" * 70)
+        config = {"configurable": {"thread_id": "resilient-demo"}}
+        failures = 0
+        for turn in range(30):
+            try:
+                agent.invoke(
+                    {"messages": [HumanMessage(content=f"Turn {turn}")]},
+                    config=with_deadline(config, seconds=3.0),
+                )
+            except Exception as error:
+                failures += 1
+                print(f"  ❌ Turn {turn} failed: {error}")
+        print(f"  ✅ {30 - failures}/30 turns succeeded "
+              f"({server.requests} requests sent, including retries and hedges)\n")
+
+        # Test 2: A deadline that's too tight
+        print("Test 2: Deadline shorter than the server's response time")
+        print("-" * 70)
+        server.faults.base_latency = 0.5
+        try:
+            agent.invoke(
+                {"messages": [HumanMessage(content="Hurry!")]},
+                config=with_deadline(config, seconds=0.2),
+            )
+        except DeadlineExceeded as error:
+            print(f"  ⏱️  DeadlineExceeded: {error}\n")
+
+        # Test 3: The server goes down completely
+        print("Test 3: Server returns 503 for everything")
+        print("-" * 70)
+        server.faults.base_latency = 0.02
+        server.faults.error_rate = 1.0
+        for turn in range(4):
+            try:
+                agent.invoke({"messages": [HumanMessage(content="Anyone there?")]}, config=config)
+            except CircuitOpenError as error:
+                print(f"  ⚡ Turn {turn}: failed fast - {error}")
+            except Exception as error:
+                print(f"  ❌ Turn {turn}: {error} (breaker: {llm.health.breaker.state})")
+
+    print("\n" + "=" * 70)
+    print("✨ Notice how:")
+    print("   1. Transient errors were retried - most turns still succeeded")
+    print("   2. The deadline came from the run config, not the node code")
+    print("   3. Once the model kept failing, the breaker opened and we failed fast")
+    print("=" * 70 + "\n")
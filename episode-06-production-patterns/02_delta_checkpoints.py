@@ -0,0 +1,88 @@
+"""
+Episode 6: Production Patterns - Part 2
+=======================================
+Delta Checkpoints
+
+In Episode 2, MemorySaver gave our agent memory. But look at what it stores:
+after every super-step, the WHOLE `messages` list. Turn 100 re-saves the 199
+messages that were already saved at turn 99. Storage grows quadratically.
+
+DeltaCheckpointSaver (delta_checkpoint.py) stores only what changed:
+- New messages, not the whole list
+- A full snapshot every `snapshot_every` checkpoints, for fast restores
+- State is rebuilt only when it's read
+
+No API key needed - the agent uses a fake model.
+"""
+
+import sys
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from delta_checkpoint import DeltaCheckpointSaver
+from demo_helpers import ScriptedModel, load_episode
+
+# Reuse Episode 2's agent
+agent_with_memory = load_episode("episode-02-memory-and-state/01_agent_with_memory.py")
+
+
+# Step 1: A Fake Model that Always Answers
+# -----------------------------------------
+def fake_llm(turns: int) -> ScriptedModel:
+    """Answers every message without calling tools (or an API)"""
+    return ScriptedModel(messages=iter([AIMessage(content=f"Reply {i}") for i in range(turns)]))
+
+
+# Step 2: Chat for a While with Each Checkpointer
+# ------------------------------------------------
+def chat(checkpointer, turns: int):
+    agent = agent_with_memory.create_agent_with_memory(llm=fake_llm(turns), checkpointer=checkpointer)
+    config = {"configurable": {"thread_id": "delta-demo"}}
+    for turn in range(turns):
+        agent.invoke({"messages": [HumanMessage(content=f"Message {turn}")]}, config=config)
+    return agent, config
+
+
+if __name__ == "__main__":
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("\n" + "=" * 70)
+    print(f"💾 Delta Checkpoints - {turns} turns of conversation")
+    print("=" * 70 + "\n")
+
+    # MemorySaver: how many bytes does it hold?
+    memory = MemorySaver()
+    chat(memory, turns)
+    memory_bytes = sum(len(blob[1]) for blob in memory.blobs.values())
+
+    # DeltaCheckpointSaver: same conversation
+    delta = DeltaCheckpointSaver(snapshot_every=50)
+    agent, config = chat(delta, turns)
+
+    print(f"MemorySaver message blobs: {memory_bytes / 1024:>10.1f} KB")
+    print(f"DeltaCheckpointSaver total: {delta.stored_bytes() / 1024:>9.1f} KB\n")
+
+    # Restoring still gives back the full conversation
+    state = agent.get_state(config)
+    print(f"Restored {len(state.values['messages'])} messages from the delta checkpoints")
+
+    # Compaction: fold delta chains into snapshots, keeping all history
+    history_before = len(list(agent.get_state_history(config)))
+    rewritten = delta.compact(max_depth=10)
+    history_after = len(list(agent.get_state_history(config)))
+    print(f"Compacted {rewritten} checkpoints into snapshots; "
+          f"history still has {history_after}/{history_before} checkpoints")
+
+    # Pruning is separate and explicit: it deletes old history
+    removed = delta.prune(keep_last=10)
+    state = agent.get_state(config)
+    print(f"Pruned {removed} old checkpoints; "
+          f"still {len(state.values['messages'])} messages in the latest state\n")
+
+    print("=" * 70)
+    print("✨ Key Takeaway:")
+    print("   - Each checkpoint stores only the NEW messages")
+    print("   - Periodic full snapshots keep restores fast")
+    print("   - compact() folds deltas into snapshots; prune() trims old history")
+    print("=" * 70 + "\n")
@@ -0,0 +1,116 @@
+"""
+Episode 6: Production Patterns - Part 3
+=======================================
+Vectorized Tools
+
+"Multiply every price by 1.2" - with Episode 2's scalar `multiply` tool the
+model has to emit one tool call per price. Each call is validated, run and
+answered on its own.
+
+Here we fix it from both sides (see vector_tools.py):
+- Array-aware `add` / `multiply`: ONE call can handle a whole list or range
+- BatchedToolNode: if the model still emits many scalar calls, they are
+  merged into one NumPy execution
+
+No API key needed - a scripted fake model plays the LLM.
+"""
+
+from typing import Annotated, Literal
+from typing_extensions import TypedDict
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from langgraph.graph import StateGraph, START, END
+from langgraph.graph.message import add_messages
+from langgraph.checkpoint.memory import MemorySaver
+
+from demo_helpers import ScriptedModel, tool_call
+from vector_tools import BatchedToolNode, add, multiply
+
+
+# Step 1: Define State (Same as Episode 2)
+# -----------------------------------------
+class AgentState(TypedDict):
+    """State that tracks conversation messages"""
+    messages: Annotated[list, add_messages]
+
+
+# Step 2: Build the Agent with Vectorized Tools
+# ----------------------------------------------
+def create_vectorized_agent(llm, checkpointer=None):
+    """
+    Episode 2's agent, with array-aware tools and a batching tool node.
+    """
+    llm_with_tools = llm.bind_tools([add, multiply])
+    tool_node = BatchedToolNode([add, multiply])
+
+    def agent_node(state: AgentState) -> AgentState:
+        """Call the LLM with the current message history"""
+        response = llm_with_tools.invoke(state["messages"])
+        return {"messages": [response]}
+
+    def should_continue(state: AgentState) -> Literal["tools", "end"]:
+        """Check if we need to call tools or end"""
+        last_message = state["messages"][-1]
+        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
+            return "tools"
+        return "end"
+
+    graph = StateGraph(AgentState)
+    graph.add_node("agent", agent_node)
+    graph.add_node("tools", tool_node)
+
+    graph.add_edge(START, "agent")
+    graph.add_conditional_edges("agent", should_continue, {"tools": "tools", "end": END})
+    graph.add_edge("tools", "agent")
+
+    return graph.compile(checkpointer=checkpointer or MemorySaver())
+
+
+if __name__ == "__main__":
+    prices = [9.99, 24.5, 3.75, 120.0, 18.2, 7.1, 42.0, 5.55, 60.0, 11.9, 2.3, 99.0]
+
+    print("\n" + "=" * 70)
+    print("🧮 Vectorized Tools - Multiply every price by 1.2")
+    print("=" * 70 + "\n")
+
+    # Test 1: The model emits one scalar call per price (the old way)
+    print("Test 1: 12 scalar multiply calls in one AIMessage")
+    print("-" * 70)
+    scalar_calls = [tool_call("multiply", a=price, b=1.2) for price in prices]
+    agent = create_vectorized_agent(ScriptedModel(messages=iter([
+        AIMessage(content="", tool_calls=scalar_calls),
+        AIMessage(content="Here are the new prices."),
+    ])))
+    result = agent.invoke(
+        {"messages": [HumanMessage(content=f"Multiply every price by 1.2: {prices}")]},
+        config={"configurable": {"thread_id": "scalar"}},
+    )
+    tool_messages = [m for m in result["messages"] if m.type == "tool"]
+    print(f"  ✅ {len(tool_messages)} ToolMessages, one per call ID: "
+          f"{[m.content for m in tool_messages[:3]]} ...\n")
+
+    # Test 2: The model uses the array-aware tool (the new way)
+    print("Test 2: ONE multiply call with a list")
+    print("-" * 70)
+    agent = create_vectorized_agent(ScriptedModel(messages=iter([
+        AIMessage(content="", tool_calls=[tool_call("multiply", a=prices, b=1.2)]),
+        AIMessage(content="Here are the new prices."),
+    ])))
+    result = agent.invoke(
+        {"messages": [HumanMessage(content=f"Multiply every price by 1.2: {prices}")]},
+        config={"configurable": {"thread_id": "vector"}},
+    )
+    print(f"  ✅ Result: {[m for m in result['messages'] if m.type == 'tool'][0].content}\n")
+
+    # Test 3: Ranges work too
+    print("Test 3: Add 100 to the range 0, 5, 10, ... 45")
+    print("-" * 70)
+    print(f"  ✅ Result: {add.invoke({'a': {'start': 0, 'stop': 50, 'step': 5}, 'b': 100})}\n")
+
+    print("=" * 70)
+    print("✨ Notice how:")
+    print("   1. Scalar calls were merged into one NumPy call, but every")
+    print("      tool call ID still got its own answer")
+    print("   2. With array-aware tools, one call does the whole column")
+    print("=" * 70 + "\n")
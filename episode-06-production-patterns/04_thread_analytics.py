@@ -0,0 +1,83 @@
+"""
+Episode 6: Production Patterns - Part 4
+=======================================
+Querying Threads
+
+Episode 3's support agent saves a `category` for every conversation. But
+to answer "which threads went to billing?" we'd have to call `get_state`
+on every thread_id, one at a time - the checkpointer is keyed by thread.
+
+IndexedCheckpointSaver (thread_index.py) wraps the checkpointer and keeps
+a small SQLite index of every thread's category, last-updated time and
+message count. Now we can filter, page through and aggregate threads.
+
+No API key needed - a fake model plays the categorizer and specialists.
+"""
+
+import random
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from demo_helpers import FakeChatModel, load_episode
+from thread_index import IndexedCheckpointSaver
+
+# Reuse Episode 3's agent
+conditional_routing = load_episode("episode-03-conditional-logic/01_conditional_routing.py")
+
+
+# Step 1: A Fake Model Instead of Claude
+# ---------------------------------------
+# The categorizer gets a random category, specialists get a canned answer
+rng = random.Random(3)
+fake_llm = FakeChatModel(
+    responder=lambda messages: (
+        rng.choice(["billing", "technical", "general"])
+        if "ONE WORD" in messages[-1].content else "Happy to help!"
+    )
+)
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 70)
+    print("🔎 Querying Threads - Secondary Indexes over Checkpoints")
+    print("=" * 70 + "\n")
+
+    # Step 2: Wrap the Checkpointer
+    # ------------------------------
+    checkpointer = IndexedCheckpointSaver(MemorySaver())
+    agent = conditional_routing.create_support_agent(checkpointer=checkpointer, llm=fake_llm)
+
+    # Step 3: Have Some Conversations
+    # --------------------------------
+    print("Running 20 support tickets...")
+    for ticket in range(20):
+        config = {"configurable": {"thread_id": f"ticket-{ticket}"}}
+        agent.invoke({"messages": [HumanMessage(content=f"Ticket #{ticket}")]}, config=config)
+    print()
+
+    # Step 4: Query the Index
+    # ------------------------
+    print("Billing threads, newest first (pages of 3):")
+    print("-" * 70)
+    page = checkpointer.find_threads(category="billing", page_size=3)
+    print(f"  Page 1: {[t.thread_id for t in page.threads]}")
+    page = checkpointer.find_threads(category="billing", page_size=3, cursor=page.next_cursor)
+    print(f"  Page 2: {[t.thread_id for t in page.threads]}\n")
+
+    print("Streaming every technical thread (never all in memory at once):")
+    print("-" * 70)
+    technical = [t.thread_id for t in checkpointer.scan_threads(category="technical", page_size=4)]
+    print(f"  {len(technical)} threads: {technical[:6]} ...\n")
+
+    print("Counts per category per hour:")
+    print("-" * 70)
+    for hour, category, count in checkpointer.counts_per_category_per_hour():
+        print(f"  {hour}  {category:<10} {count}")
+
+    print("\n" + "=" * 70)
+    print("✨ Key Takeaway:")
+    print("   - The index is updated on every checkpoint - no replaying threads")
+    print("   - Cursors page through results without OFFSET scans")
+    print("   - The real state is still one get_state() away")
+    print("=" * 70 + "\n")
@@ -0,0 +1,80 @@
+"""
+Episode 6: Production Patterns - Part 5
+=======================================
+Profiling a Graph Run
+
+When an agent feels slow, is it the model... or everything around it?
+A graph run also spends time in reducers (`add_messages`), routing
+functions (`should_continue`, `route_to_specialist`), checkpoint
+serialization and tool dispatch.
+
+GraphProfiler (profiling.py) is an opt-in wrapper around a compiled agent.
+It times every node, router, model call, tool call, reducer and
+checkpointer call per super-step, and samples stacks for a flame graph.
+
+No API key needed - fake models play the LLM.
+"""
+
+import tempfile
+from pathlib import Path
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from demo_helpers import FakeChatModel, ScriptedModel, load_episode, support_responder, tool_call
+from profiling import GraphProfiler
+
+# Step 1: Reuse Earlier Episodes' Agents
+# ---------------------------------------
+agent_with_memory = load_episode("episode-02-memory-and-state/01_agent_with_memory.py")
+conditional_routing = load_episode("episode-03-conditional-logic/01_conditional_routing.py")
+
+
+if __name__ == "__main__":
+    out_dir = Path(tempfile.gettempdir())
+
+    print("\n" + "=" * 70)
+    print("🔥 Profiling a Graph Run - Where Does the Time Go?")
+    print("=" * 70 + "\n")
+
+    # Step 2: Profile Episode 2's Agent (agent → tools → agent)
+    # ----------------------------------------------------------
+    print("Test 1: Episode 2's agent, one tool round trip")
+    print("-" * 70)
+    agent = agent_with_memory.create_agent_with_memory(llm=ScriptedModel(messages=iter([
+        AIMessage(content="", tool_calls=[tool_call("multiply", a=12, b=7)]),
+        AIMessage(content="12 times 7 is 84."),
+    ])))
+    profiler = GraphProfiler(agent)
+    profiler.invoke(
+        {"messages": [HumanMessage(content="What is 12 times 7?")]},
+        config={"configurable": {"thread_id": "profile-ep2"}},
+    )
+    print(profiler.summary_table())
+    path = profiler.write_collapsed(out_dir / "episode02_agent.folded")
+    print(f"\n  ✅ Flame graph data: {path}\n")
+
+    # Step 3: Profile Episode 3's Support Agent (categorize → route → specialist)
+    # ----------------------------------------------------------------------------
+    print("Test 2: Episode 3's support agent, 5 tickets")
+    print("-" * 70)
+    # A fake model that answers the categorizer ("billing") and the specialist
+    agent = conditional_routing.create_support_agent(llm=FakeChatModel(responder=support_responder()))
+    with GraphProfiler(agent) as profiler:  # One sampler for all 5 runs
+        for ticket in range(5):
+            profiler.invoke(
+                {"messages": [HumanMessage(content=f"Ticket #{ticket}: I was charged twice")]},
+                config={"configurable": {"thread_id": f"ticket-{ticket}"}},
+            )
+    totals = profiler.totals_by_kind()
+    for kind, seconds in totals.items():
+        print(f"  {kind:<11} {seconds * 1000:>8.2f} ms  {seconds / profiler.run_wall:>6.1%}")
+    path = profiler.write_collapsed(out_dir / "episode03_support.folded")
+    print(f"\n  ✅ Flame graph data: {path}\n")
+
+    print("=" * 70)
+    print("✨ Notice how:")
+    print("   1. With instant fake models, everything left is framework time:")
+    print("      reducers, routers, checkpoints and LangGraph's own scheduling")
+    print("   2. Every row is tied to the super-step it ran in")
+    print("   3. Open the .folded files with flamegraph.pl or speedscope.app")
+    print("=" * 70 + "\n")
@@ -0,0 +1,492 @@
+"""
+Delta Checkpoints
+=================
+A checkpointer that stores what CHANGED at each super-step, not the whole state.
+
+With `MemorySaver`, every super-step stores the full value of every changed
+channel. The `messages` list changes on every step, so a conversation with
+N messages writes 1 + 2 + ... + N messages in total - quadratic growth.
+
+`DeltaCheckpointSaver` stores, per checkpoint:
+- Only the channels that changed (like MemorySaver)
+- For list channels that only grew (e.g. `messages` with `add_messages`),
+  only the NEW items
+- Every `snapshot_every` checkpoints, a full snapshot, so restoring a
+  thread never replays more than `snapshot_every` deltas
+
+State is rebuilt lazily, only when a checkpoint is read, and recently
+used states are cached. `compact()` (or a background compactor) folds
+delta chains into snapshots without losing any checkpoint; dropping old
+history is a separate, explicit `prune()`.
+
+Usage (a drop-in replacement for MemorySaver):
+
+    checkpointer = DeltaCheckpointSaver(snapshot_every=50)
+    agent = create_agent_with_memory(checkpointer=checkpointer)
+"""
+
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+
+
+# Step 1: What We Store per Checkpoint
+# -------------------------------------
+@dataclass
+class DeltaRecord:
+    """One stored checkpoint (all fields already serialized)"""
+    checkpoint: tuple[str, bytes]  # Checkpoint without channel_values
+    metadata: tuple[str, bytes]
+    parent_id: Optional[str]
+    full: bool  # True = `values` is a full snapshot, False = a delta
+    depth: int  # Deltas since the last full snapshot
+    values: tuple[str, bytes]
+
+    @property
+    def size(self) -> int:
+        return len(self.checkpoint[1]) + len(self.metadata[1]) + len(self.values[1])
+
+
+def diff_channels(previous: dict, values: dict, changed: Sequence[str]) -> dict:
+    """
+    Encode the changed channels relative to the previous state:
+    - "append": list channels that only grew -> just the new items
+    - "set": everything else that changed -> the new value
+    - "unset": channels that no longer have a value
+    """
+    delta = {"set": {}, "append": {}, "unset": []}
+    for channel in changed:
+        if channel not in values:
+            delta["unset"].append(channel)
+            continue
+        new, old = values[channel], previous.get(channel)
+        if isinstance(new, list) and isinstance(old, list) and _extends(new, old):
+            delta["append"][channel] = new[len(old):]
+        else:
+            delta["set"][channel] = new
+    return delta
+
+
+def apply_delta(previous: dict, delta: dict) -> dict:
+    """Rebuild a state from the previous state and a delta."""
+    values = dict(previous)
+    for channel in delta["unset"]:
+        values.pop(channel, None)
+    for channel, items in delta["append"].items():
+        values[channel] = values.get(channel, []) + items
+    values.update(delta["set"])
+    return values
+
+
+def _copy_values(values: dict) -> dict:
+    """
+    Copy the containers of a state, so neither the caller nor the graph can
+    change a cached checkpoint by appending to a list it was handed.
+    """
+    return {
+        k: type(v)(v) if isinstance(v, (list, dict, set)) else v
+        for k, v in values.items()
+    }
+
+
+def _extends(new: list, old: list) -> bool:
+    """True if `new` starts with every item of `old` (it only grew)."""
+    if len(new) < len(old):
+        return False
+    # Identity check first: add_messages keeps the existing message objects
+    return all(a is b or a == b for a, b in zip(new, old))
+
+
+# Step 2: The Checkpointer
+# -------------------------
+class DeltaCheckpointSaver(BaseCheckpointSaver):
+    """
+    In-memory checkpointer with delta-encoded checkpoints.
+
+    Args:
+        snapshot_every: Write a full snapshot after this many deltas.
+        cache_size: Number of rebuilt states to keep in memory.
+        serde: Serializer (defaults to LangGraph's JsonPlusSerializer).
+    """
+
+    def __init__(self, *, snapshot_every: int = 50, cache_size: int = 128, serde=None):
+        super().__init__(serde=serde)
+        self.snapshot_every = snapshot_every
+        self.cache_size = cache_size
+        # (thread ID, checkpoint NS) -> checkpoint ID -> record
+        self.records: defaultdict[tuple[str, str], dict[str, DeltaRecord]] = defaultdict(dict)
+        # (thread ID, checkpoint NS, checkpoint ID) -> (task ID, idx) -> write
+        self.writes: defaultdict[tuple[str, str, str], dict] = defaultdict(dict)
+        # Rebuilt states, most recently used last
+        self._states: OrderedDict[tuple[str, str, str], dict] = OrderedDict()
+        self._lock = threading.RLock()
+        self._compactor: Optional[threading.Thread] = None
+        self._stop_compactor = threading.Event()
+        self.bytes_written = 0
+
+    # Writing
+    # -------
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+
+        c = checkpoint.copy()
+        values: dict[str, Any] = c.pop("channel_values")
+
+        with self._lock:
+            thread = self.records[(thread_id, checkpoint_ns)]
+            parent = thread.get(parent_id) if parent_id else None
+
+            if parent is None or parent.depth + 1 >= self.snapshot_every:
+                full, depth, payload = True, 0, values
+            else:
+                previous = self._load_values(thread_id, checkpoint_ns, parent_id)
+                full, depth = False, parent.depth + 1
+                payload = diff_channels(previous, values, list(new_versions))
+
+            record = DeltaRecord(
+                checkpoint=self.serde.dumps_typed(c),
+                metadata=self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+                parent_id=parent_id,
+                full=full,
+                depth=depth,
+                values=self.serde.dumps_typed(payload),
+            )
+            thread[checkpoint["id"]] = record
+            self.bytes_written += record.size
+
+            # The state we were just given is the one most likely to be read next
+            self._cache((thread_id, checkpoint_ns, checkpoint["id"]), _copy_values(values))
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        with self._lock:
+            stored = self.writes[(thread_id, checkpoint_ns, checkpoint_id)]
+            for idx, (channel, value) in enumerate(writes):
+                key = (task_id, WRITES_IDX_MAP.get(channel, idx))
+                if key[1] >= 0 and key in stored:
+                    continue
+                data = self.serde.dumps_typed(value)
+                stored[key] = (task_id, channel, data, task_path)
+                self.bytes_written += len(data[1])
+
+    # Reading
+    # -------
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        with self._lock:
+            thread = self.records.get((thread_id, checkpoint_ns))
+            if not thread:
+                return None
+            checkpoint_id = get_checkpoint_id(config) or max(thread)
+            if checkpoint_id not in thread:
+                return None
+            return self._tuple(thread_id, checkpoint_ns, checkpoint_id)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            keys = [
+                key for key in self.records
+                if config is None
+                or (
+                    key[0] == config["configurable"]["thread_id"]
+                    and key[1] == config["configurable"].get("checkpoint_ns", key[1])
+                )
+            ]
+        config_checkpoint_id = get_checkpoint_id(config) if config else None
+        before_id = get_checkpoint_id(before) if before else None
+
+        for thread_id, checkpoint_ns in keys:
+            with self._lock:
+                ids = sorted(self.records.get((thread_id, checkpoint_ns), {}), reverse=True)
+            for checkpoint_id in ids:
+                if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                    continue
+                if before_id and checkpoint_id >= before_id:
+                    continue
+                if limit is not None and limit <= 0:
+                    return
+                # Built one at a time, only when the caller asks for the next one.
+                # The lock is released before yielding, so a slow caller never
+                # blocks `put` on other threads.
+                with self._lock:
+                    record = self.records.get((thread_id, checkpoint_ns), {}).get(checkpoint_id)
+                    if record is None:
+                        continue  # Pruned or deleted since we listed the IDs
+                    if filter:
+                        metadata = self.serde.loads_typed(record.metadata)
+                        if not all(metadata.get(k) == v for k, v in filter.items()):
+                            continue
+                    item = self._tuple(thread_id, checkpoint_ns, checkpoint_id)
+                if limit is not None:
+                    limit -= 1
+                yield item
+
+    def _tuple(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> CheckpointTuple:
+        record = self.records[(thread_id, checkpoint_ns)][checkpoint_id]
+        checkpoint = self.serde.loads_typed(record.checkpoint)
+        checkpoint["channel_values"] = self._load_values(thread_id, checkpoint_ns, checkpoint_id)
+        stored = self.writes.get((thread_id, checkpoint_ns, checkpoint_id), {})
+        writes = [stored[k] for k in sorted(stored, key=lambda k: writes_sort_key(stored[k][3], *k))]
+
+        def config_for(cid):
+            return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": cid}}
+
+        return CheckpointTuple(
+            config=config_for(checkpoint_id),
+            checkpoint=checkpoint,
+            metadata=self.serde.loads_typed(record.metadata),
+            parent_config=config_for(record.parent_id) if record.parent_id else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed(value))
+                for task_id, channel, value, _ in writes
+            ],
+        )
+
+    def _load_values(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> dict:
+        """Rebuild the channel values of a checkpoint (lazily, with a cache)."""
+        key = (thread_id, checkpoint_ns, checkpoint_id)
+        if key in self._states:
+            self._states.move_to_end(key)
+            return _copy_values(self._states[key])
+
+        # Walk back to the nearest full snapshot (or cached state)...
+        thread = self.records[(thread_id, checkpoint_ns)]
+        chain, values, current = [], None, checkpoint_id
+        while current is not None:
+            cached = self._states.get((thread_id, checkpoint_ns, current))
+            if cached is not None:
+                values = dict(cached)
+                break
+            record = thread[current]
+            if record.full:
+                values = self.serde.loads_typed(record.values)
+                break
+            chain.append(record)
+            current = record.parent_id
+
+        # ...then replay the deltas forward
+        for record in reversed(chain):
+            values = apply_delta(values or {}, self.serde.loads_typed(record.values))
+
+        self._cache(key, values)
+        return _copy_values(values)
+
+    def _cache(self, key: tuple[str, str, str], values: dict) -> None:
+        self._states[key] = values
+        self._states.move_to_end(key)
+        while len(self._states) > self.cache_size:
+            self._states.popitem(last=False)
+
+    # Deleting and Compacting
+    # -----------------------
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self.records if k[0] == thread_id]:
+                del self.records[key]
+            for key in [k for k in self.writes if k[0] == thread_id]:
+                del self.writes[key]
+            for key in [k for k in self._states if k[0] == thread_id]:
+                del self._states[key]
+
+    def compact(self, max_depth: Optional[int] = None) -> int:
+        """
+        Fold delta chains into full snapshots. Lossless: every checkpoint
+        (and so `get_state_history` and time travel) is kept.
+
+        - The newest checkpoint of every thread becomes a snapshot, so
+          resuming a thread replays no deltas
+        - With `max_depth`, so does every checkpoint more than `max_depth`
+          deltas away from a snapshot
+
+        Returns how many checkpoints were rewritten.
+        """
+        rewritten = 0
+        with self._lock:
+            for (thread_id, checkpoint_ns), thread in list(self.records.items()):
+                ids = sorted(thread)  # Checkpoint IDs are time-ordered: parents first
+                for checkpoint_id in ids:
+                    record = thread[checkpoint_id]
+                    if record.full:
+                        record.depth = 0
+                        continue
+                    parent = thread.get(record.parent_id)
+                    if parent is not None:
+                        record.depth = parent.depth + 1
+                    too_deep = max_depth is not None and record.depth > max_depth
+                    if checkpoint_id == ids[-1] or too_deep:
+                        self._make_snapshot(thread_id, checkpoint_ns, checkpoint_id)
+                        rewritten += 1
+        return rewritten
+
+    def _make_snapshot(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> None:
+        """Replace a delta record with the full state it stands for."""
+        values = self._load_values(thread_id, checkpoint_ns, checkpoint_id)
+        record = self.records[(thread_id, checkpoint_ns)][checkpoint_id]
+        record.values = self.serde.dumps_typed(values)
+        record.full, record.depth = True, 0
+        self.bytes_written += len(record.values[1])
+
+    def prune(self, keep_last: int) -> int:
+        """
+        Drop all but the `keep_last` newest checkpoints of every thread.
+        This DELETES history: older checkpoints can no longer be listed or
+        resumed from. The oldest checkpoint kept becomes a full snapshot, so
+        every remaining checkpoint can still be restored. Returns how many
+        checkpoints were removed.
+        """
+        removed = 0
+        with self._lock:
+            for (thread_id, checkpoint_ns), thread in list(self.records.items()):
+                ids = sorted(thread)
+                if len(ids) <= keep_last:
+                    continue
+                drop, keep = ids[:-keep_last], ids[-keep_last:]
+
+                # Rebase the oldest kept checkpoint onto a full snapshot
+                if not thread[keep[0]].full:
+                    self._make_snapshot(thread_id, checkpoint_ns, keep[0])
+                    self._rebase_depths(thread, keep)
+                thread[keep[0]].parent_id = None
+
+                for checkpoint_id in drop:
+                    del thread[checkpoint_id]
+                    self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+                    self._states.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+                removed += len(drop)
+        return removed
+
+    @staticmethod
+    def _rebase_depths(thread: dict[str, DeltaRecord], ids: Sequence[str]) -> None:
+        """Recompute delta depths after a record became a full snapshot."""
+        for checkpoint_id in ids:
+            record = thread[checkpoint_id]
+            if record.full:
+                record.depth = 0
+            elif record.parent_id in thread:
+                record.depth = thread[record.parent_id].depth + 1
+
+    def start_background_compaction(
+        self,
+        interval: float = 60.0,
+        max_depth: Optional[int] = None,
+        prune_keep_last: Optional[int] = None,
+    ) -> None:
+        """
+        Run `compact()` every `interval` seconds on a daemon thread.
+        History is only pruned if you also pass `prune_keep_last`.
+        """
+        if self._compactor is not None:
+            return
+        self._stop_compactor.clear()
+
+        def run():
+            while not self._stop_compactor.wait(interval):
+                self.compact(max_depth=max_depth)
+                if prune_keep_last is not None:
+                    self.prune(keep_last=prune_keep_last)
+
+        self._compactor = threading.Thread(target=run, daemon=True, name="delta-compactor")
+        self._compactor.start()
+
+    def stop_background_compaction(self) -> None:
+        if self._compactor is not None:
+            self._stop_compactor.set()
+            self._compactor.join()
+            self._compactor = None
+
+    # Size Accounting
+    # ---------------
+    def stored_bytes(self) -> int:
+        """Bytes currently stored (checkpoints + pending writes)."""
+        with self._lock:
+            records = sum(r.size for thread in self.records.values() for r in thread.values())
+            writes = sum(
+                len(w[2][1]) for stored in self.writes.values() for w in stored.values()
+            )
+        return records + writes
+
+    # Async Versions
+    # --------------
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        return self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return self.delete_thread(thread_id)
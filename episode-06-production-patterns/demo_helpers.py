@@ -0,0 +1,115 @@
+"""
+Demo Helpers
+============
+Shared by the Episode 6 demos and the benchmarks (`benchmarks/`):
+
+- `load_episode()`: import an earlier episode's script by path
+- Fake chat models that behave like a real model (BaseChatModel, `invoke`,
+  `bind_tools`) but answer instantly or after a fixed `latency`, so no API
+  key is needed and timings measure the graph - not the network
+"""
+
+import importlib.util
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+# Loading Earlier Episodes
+# ------------------------
+def load_episode(relative_path: str):
+    """
+    Import an episode script by path (their names start with digits, so a
+    normal `import` can't load them), e.g.
+
+        routing = load_episode("episode-03-conditional-logic/01_conditional_routing.py")
+    """
+    path = REPO_ROOT / relative_path
+    name = "episode_" + path.stem
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Fake Models
+# -----------
+class FakeChatModel(BaseChatModel):
+    """
+    A chat model that sleeps for `latency` seconds, then answers with
+    `responder(messages)` (an AIMessage or a string). Echoes by default.
+    """
+
+    latency: float = 0.0
+    responder: Optional[Callable[[list[BaseMessage]], Union[AIMessage, str]]] = None
+    model: str = "fake"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> "FakeChatModel":
+        return self
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.responder is None:
+            reply = f"Echo: {messages[-1].content}"
+        else:
+            reply = self.responder(messages)
+        if isinstance(reply, str):
+            reply = AIMessage(content=reply)
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+
+class ScriptedModel(GenericFakeChatModel):
+    """Plays back a fixed list of AIMessages; ignores the tools it's given"""
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> "ScriptedModel":
+        return self
+
+
+def tool_call(name: str, **args: Any) -> dict:
+    """A tool call dict, as it appears in `AIMessage.tool_calls`."""
+    return {"name": name, "args": args, "id": f"call_{uuid.uuid4().hex[:8]}"}
+
+
+def tool_round_trip(name: str = "multiply", **args: Any) -> Callable[[list[BaseMessage]], AIMessage]:
+    """Responder: call tool `name` once, then answer once the result is back."""
+    args = args or {"a": 12, "b": 7}
+
+    def respond(messages: list[BaseMessage]) -> AIMessage:
+        if isinstance(messages[-1], ToolMessage):
+            return AIMessage(content=f"The answer is {messages[-1].content}.")
+        return AIMessage(content="", tool_calls=[tool_call(name, **args)])
+
+    return respond
+
+
+def support_responder(scores: Optional[dict[str, float]] = None) -> Callable[[list[BaseMessage]], str]:
+    """
+    Responder for Episode 3's support agent: answers the categorization
+    prompt, the multi-label scoring prompt, and the specialists.
+    """
+    scores = scores or {"billing": 0.9, "technical": 0.1, "general": 0.1}
+
+    def respond(messages: list[BaseMessage]) -> str:
+        prompt = messages[-1].content
+        if "ONE WORD" in prompt:
+            return max(scores, key=scores.get)
+        if "JSON" in prompt:
+            return json.dumps(scores)
+        return "Happy to help!"
+
+    return respond
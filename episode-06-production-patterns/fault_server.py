@@ -0,0 +1,168 @@
+"""
+Fault-Injecting Fake Model Server
+=================================
+A tiny local HTTP server that pretends to be an LLM API - and misbehaves
+on purpose, so we can test the resilience layer without burning API credits.
+
+Faults it can inject:
+- Latency spikes: some requests take much longer than usual
+- Errors: some requests fail with HTTP 503 (overloaded)
+
+`FaultServerChatModel` is a LangChain chat model that talks to this server,
+so it can be used anywhere a real model would be (including graph nodes).
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+# Step 1: Describe the Faults
+# ----------------------------
+@dataclass
+class FaultConfig:
+    """How badly the fake server should behave"""
+    base_latency: float = 0.02  # Normal response time (seconds)
+    jitter: float = 0.01  # Random extra latency on every request
+    slow_rate: float = 0.05  # Fraction of requests that hit a latency spike
+    slow_latency: float = 1.0  # How long a latency spike lasts
+    error_rate: float = 0.05  # Fraction of requests that fail with a 503
+    seed: Optional[int] = None
+
+
+class HTTPStatusError(RuntimeError):
+    """
+    An HTTP error response, carrying `status_code` like SDK errors do.
+    Not a ConnectionError: the server answered, so only the status code
+    decides whether it's worth retrying.
+    """
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"HTTP {status_code}: {message}")
+        self.status_code = status_code
+
+
+# Step 2: The Server
+# -------------------
+class FaultServer:
+    """
+    Runs the fake model API on a background thread.
+
+    Use it as a context manager:
+
+        with FaultServer(FaultConfig(error_rate=0.1)) as server:
+            model = FaultServerChatModel(url=server.url)
+    """
+
+    def __init__(self, faults: Optional[FaultConfig] = None, port: int = 0):
+        self.faults = faults or FaultConfig()
+        self.random = random.Random(self.faults.seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/messages"
+
+    def _next_fault(self) -> tuple[float, bool]:
+        """Pick this request's latency and whether it fails (thread-safe)."""
+        faults = self.faults
+        with self._lock:
+            self.requests += 1
+            latency = faults.base_latency + self.random.uniform(0, faults.jitter)
+            if self.random.random() < faults.slow_rate:
+                latency = faults.slow_latency
+            fail = self.random.random() < faults.error_rate
+        return latency, fail
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                latency, fail = server._next_fault()
+                time.sleep(latency)
+
+                if fail:
+                    status, payload = 503, {"error": "overloaded"}
+                else:
+                    last = body.get("messages", [{}])[-1].get("content", "")
+                    status, payload = 200, {"content": f"Echo: {last}"}
+
+                data = json.dumps(payload).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client gave up (timeout or hedge won) - that's fine
+
+            def log_message(self, format, *args):
+                pass  # Keep the demo output clean
+
+        return Handler
+
+    def start(self) -> "FaultServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FaultServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+# Step 3: A Chat Model that Talks to the Server
+# ----------------------------------------------
+class FaultServerChatModel(BaseChatModel):
+    """Chat model backed by the fake server. Replies by echoing the last message."""
+
+    url: str
+    model: str = "fault-server"
+    timeout: float = 60.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fault-server"
+
+    def bind_tools(self, tools: list, **kwargs: Any):
+        # The fake server never calls tools, but graphs expect bind_tools to exist
+        return self
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        payload = {"messages": [{"role": m.type, "content": m.content} for m in messages]}
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                content = json.loads(response.read())["content"]
+        except urllib.error.HTTPError as error:
+            raise HTTPStatusError(error.code, error.reason) from None
+
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
@@ -0,0 +1,370 @@
+"""
+Graph Profiling
+===============
+Where does the time in a graph run go?
+
+A graph run is more than model calls. Between them LangGraph runs reducers
+(`add_messages`), routing functions (`should_continue`), checkpoint
+serialization and tool dispatch. `GraphProfiler` makes that visible.
+
+It combines two techniques:
+- Tracing: callbacks and thin wrappers time every node, router, model call,
+  tool call, reducer and checkpointer call - wall time AND CPU time - and
+  record which super-step it belonged to
+- Sampling: a background thread samples Python stacks every millisecond,
+  labelled with the step and component that was running, and writes them
+  as "collapsed stacks" that flame graph tools understand
+
+Profiling is opt-in and only affects the runs you make through the profiler:
+
+    profiler = GraphProfiler(agent)
+    profiler.invoke({"messages": [...]}, config)
+    print(profiler.summary_table())
+
+    with profiler:  # Many short runs: keep the sampler running between them
+        for config in configs:
+            profiler.invoke(inputs, config)
+    profiler.write_collapsed("agent.folded")  # flamegraph.pl / speedscope
+"""
+
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableConfig
+
+
+# Step 1: What We Record
+# -----------------------
+@dataclass
+class Span:
+    """One timed piece of work inside a graph run"""
+    step: int  # Super-step (-1 = before the first node runs)
+    kind: str  # node, router, model, tool, reducer, checkpoint
+    name: str
+    wall: float  # Seconds
+    cpu: float  # Seconds of CPU time on the thread that did the work
+    self_wall: float = 0.0  # Wall time minus nested model/tool/router spans
+    self_cpu: float = 0.0  # CPU time minus nested model/tool/router spans
+
+
+KINDS = ["node", "router", "model", "tool", "reducer", "checkpoint"]
+CHECKPOINT_METHODS = ["get_tuple", "put", "put_writes"]
+
+# The profiler whose `invoke` we're inside. LangGraph copies the context into
+# the threads that run nodes and checkpoint writes, so this follows the run -
+# and a plain `graph.invoke` on another thread never sees it.
+_profiling: ContextVar[Optional["GraphProfiler"]] = ContextVar("graph_profiler", default=None)
+
+
+# Step 2: Tracing Nodes, Routers, Models and Tools with Callbacks
+# ----------------------------------------------------------------
+class _ProfilingCallbacks(BaseCallbackHandler):
+    """Turns LangChain callback events into Spans."""
+
+    run_inline = True  # Run in the thread doing the work, so CPU time is right
+
+    def __init__(self, profiler: "GraphProfiler"):
+        self.profiler = profiler
+        self.graph_run: Optional[UUID] = None
+        self.open: dict[UUID, tuple] = {}  # run_id -> (kind, name, step, wall0, cpu0, owner, thread)
+        self.nested: defaultdict[UUID, list] = defaultdict(lambda: [0.0, 0.0])  # owner run -> child wall, cpu
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], kind: str, name: str, metadata: dict):
+        step = (metadata or {}).get("langgraph_step", self.profiler.step)
+        owner = parent_run_id if parent_run_id in self.open else None
+        thread = threading.get_ident()
+        self.open[run_id] = (kind, name, step, time.perf_counter(), time.thread_time(), owner, thread)
+        self.profiler._enter(step, kind, name)
+
+    def _end(self, run_id: UUID):
+        entry = self.open.pop(run_id, None)
+        if entry is None:
+            return
+        kind, name, step, wall0, cpu0, owner, thread = entry
+        wall, cpu = time.perf_counter() - wall0, time.thread_time() - cpu0
+        if owner in self.open:
+            self.nested[owner][0] += wall
+            if self.open[owner][6] == thread:  # CPU time only adds up on the same thread
+                self.nested[owner][1] += cpu
+        nested_wall, nested_cpu = self.nested.pop(run_id, (0.0, 0.0))
+        self.profiler._exit()
+        self.profiler._record(Span(step, kind, name, wall, cpu, wall - nested_wall, cpu - nested_cpu))
+
+    # Chains: the graph itself, its nodes, and routers inside a node's task
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or ""
+        if self.graph_run is None:
+            self.graph_run = run_id  # The outermost chain is the graph run
+            return
+        if parent_run_id == self.graph_run:
+            self.profiler.step = max(self.profiler.step, (metadata or {}).get("langgraph_step", 0))
+            self._start(run_id, parent_run_id, "node", name, metadata)
+        elif parent_run_id in self.open and self.open[parent_run_id][0] == "node":
+            self._start(run_id, parent_run_id, "router", name, metadata)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id)
+
+    # Models
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._start(run_id, parent_run_id, "model", kwargs.get("name") or "chat_model", metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._start(run_id, parent_run_id, "model", kwargs.get("name") or "llm", metadata)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id)
+
+    # Tools
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._start(run_id, parent_run_id, "tool", name, metadata)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id)
+
+
+# Step 3: The Profiler
+# ---------------------
+class GraphProfiler:
+    """
+    Opt-in profiler for a compiled graph.
+
+    Args:
+        graph: A compiled graph (e.g. `create_agent_with_memory()`).
+        sample_interval: Seconds between stack samples (None = no sampling).
+    """
+
+    def __init__(self, graph, sample_interval: Optional[float] = 0.001):
+        self.graph = graph
+        self.sample_interval = sample_interval
+        self.spans: list[Span] = []
+        self.samples: Counter = Counter()
+        self.run_wall = 0.0
+        self.runs = 0
+        self.step = -1
+        self._labels: dict[int, list[str]] = defaultdict(list)  # thread id -> label stack
+        self._lock = threading.Lock()
+        self._originals: list[tuple[Any, str, Any]] = []
+        self._active = False  # True while a profiled run is in progress (for the sampler)
+        self._run_thread: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # Instrumentation (reducers and checkpointer)
+    # -------------------------------------------
+    def _instrument(self) -> None:
+        # Reducers live on the graph's channels; per-run copies reuse `operator`.
+        # The graph is shared, so the wrappers only time runs started by `invoke`.
+        for channel_name, channel in self.graph.channels.items():
+            operator = getattr(channel, "operator", None)
+            if operator is not None:
+                self._patch(channel, "operator", self._timed("reducer", channel_name, operator))
+
+        checkpointer = self.graph.checkpointer
+        if checkpointer is not None and checkpointer is not True:
+            for method in CHECKPOINT_METHODS:
+                self._patch(checkpointer, method, self._timed("checkpoint", method, getattr(checkpointer, method)))
+
+    def _patch(self, owner: Any, attr: str, value: Any) -> None:
+        self._originals.append((owner, attr, getattr(owner, attr)))
+        setattr(owner, attr, value)
+
+    def _restore(self) -> None:
+        for owner, attr, original in reversed(self._originals):
+            setattr(owner, attr, original)
+        self._originals.clear()
+
+    def _timed(self, kind: str, name: str, fn):
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            if _profiling.get() is not self:
+                return fn(*args, **kwargs)  # Not our run (e.g. another thread's graph.invoke)
+            step = self.step
+            if kind == "checkpoint" and name == "put" and len(args) >= 3:
+                step = args[2].get("step", step)  # put(config, checkpoint, metadata, ...)
+            self._enter(step, kind, name)
+            wall0, cpu0 = time.perf_counter(), time.thread_time()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                wall = time.perf_counter() - wall0
+                self._exit()
+                cpu = time.thread_time() - cpu0
+                self._record(Span(step, kind, name, wall, cpu, wall, cpu))
+        return timed
+
+    # Bookkeeping shared by tracing and sampling
+    # ------------------------------------------
+    def _enter(self, step: int, kind: str, name: str) -> None:
+        labels = self._labels[threading.get_ident()]
+        if not labels:
+            labels.append(f"step {step}" if step >= 0 else "input")
+        labels.append(f"{kind}:{name}")
+
+    def _exit(self) -> None:
+        labels = self._labels[threading.get_ident()]
+        if labels:
+            labels.pop()
+        if len(labels) == 1:
+            labels.clear()
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    # Sampling
+    # --------
+    def _sample_loop(self, stop: threading.Event) -> None:
+        me = threading.get_ident()
+        while not stop.wait(self.sample_interval):
+            if not self._active:
+                continue  # Between runs
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                labels = list(self._labels.get(thread_id, ()))
+                if not labels:
+                    if thread_id != self._run_thread:
+                        continue  # Idle worker threads
+                    labels = [f"step {self.step}" if self.step >= 0 else "input", "framework"]
+                self.samples[";".join(["graph"] + labels + _stack(frame))] += 1
+
+    # Running
+    # -------
+    def start(self) -> None:
+        """Instrument the graph and start sampling. `invoke` does this for you."""
+        if self._sampler is not None or self._originals:
+            return
+        self._instrument()
+        if self.sample_interval:
+            self._stop = threading.Event()
+            self._sampler = threading.Thread(target=self._sample_loop, args=(self._stop,), daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop sampling and put the graph back the way it was."""
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        self._restore()
+
+    def __enter__(self) -> "GraphProfiler":
+        # Keep the profiler running across many short invokes
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs) -> Any:
+        """Run the graph once with profiling on. Same arguments as `graph.invoke`."""
+        config = dict(config or {})
+        config["callbacks"] = list(config.get("callbacks") or []) + [_ProfilingCallbacks(self)]
+
+        started_here = self._sampler is None and not self._originals
+        if started_here:
+            self.start()
+        self.step = -1
+        self._run_thread = threading.get_ident()
+        self._active = True
+        token = _profiling.set(self)
+        start = time.perf_counter()
+        try:
+            return self.graph.invoke(input, config, **kwargs)
+        finally:
+            self.run_wall += time.perf_counter() - start
+            self.runs += 1
+            _profiling.reset(token)
+            self._active = False
+            if started_here:
+                self.stop()
+
+    def reset(self) -> None:
+        self.spans.clear()
+        self.samples.clear()
+        self.run_wall, self.runs = 0.0, 0
+
+    # Reports
+    # -------
+    def totals_by_kind(self) -> dict[str, float]:
+        """
+        Wall seconds per kind of work, summed over all runs. Nodes count only
+        their own time (model, tool and router calls inside them are excluded),
+        and "framework" is whatever is left: LangGraph's own scheduling.
+
+        Checkpoint writes can run on a background thread while the next step
+        starts, so "framework" is a lower bound when they overlap.
+        """
+        totals = {kind: 0.0 for kind in KINDS}
+        for span in self.spans:
+            totals[span.kind] += span.self_wall if span.kind == "node" else span.wall
+        # Routers run inside nodes and models/tools inside nodes, so no double counting
+        totals["framework"] = max(0.0, self.run_wall - sum(totals.values()))
+        return totals
+
+    def summary_table(self) -> str:
+        """Per-super-step table of where the time went."""
+        rows: dict[tuple, list[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+        for span in self.spans:
+            row = rows[(span.step, span.kind, span.name)]
+            row[0] += 1
+            row[1] += span.self_wall if span.kind == "node" else span.wall
+            row[2] += span.self_cpu if span.kind == "node" else span.cpu
+
+        lines = [
+            f"{'step':>5}  {'kind':<11} {'name':<24} {'calls':>6} {'wall ms':>10} {'cpu ms':>10}",
+            "-" * 72,
+        ]
+        for (step, kind, name), (calls, wall, cpu) in sorted(rows.items(), key=lambda r: (r[0][0], KINDS.index(r[0][1]), r[0][2])):
+            label = "input" if step < 0 else str(step)
+            lines.append(f"{label:>5}  {kind:<11} {name[:24]:<24} {calls:>6} {wall * 1000:>10.3f} {cpu * 1000:>10.3f}")
+
+        totals = self.totals_by_kind()
+        lines.append("-" * 72)
+        for kind, wall in totals.items():
+            share = wall / self.run_wall if self.run_wall else 0.0
+            lines.append(f"{'total':>5}  {kind:<11} {'':<24} {'':>6} {wall * 1000:>10.3f} {share:>9.1%}")
+        lines.append(f"{'':>5}  {'run wall':<11} {f'{self.runs} run(s)':<24} {'':>6} {self.run_wall * 1000:>10.3f}")
+        return "\n".join(lines)
+
+    def write_collapsed(self, path: str) -> Path:
+        """Write samples as collapsed stacks ("a;b;c count" per line)."""
+        path = Path(path)
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in sorted(self.samples.items())))
+        return path
+
+
+def _stack(frame) -> list[str]:
+    """Outermost-first list of "file:function" for a frame."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+def profile_graph(graph, sample_interval: Optional[float] = 0.001) -> GraphProfiler:
+    """Shortcut: `profiler = profile_graph(agent)`."""
+    return GraphProfiler(graph, sample_interval=sample_interval)
@@ -0,0 +1,365 @@
+"""
+Resilience Layer for Model Calls
+================================
+Retries, hedged requests, deadlines and circuit breakers for LLM calls.
+
+Every node in Episodes 1-3 calls `llm.invoke(...)` directly. If the upstream
+API is slow or returns a 503, the whole graph run waits (or crashes).
+
+`ResilientChatModel` wraps any chat model and adds:
+- Deadline propagation: a deadline set in the graph-run config bounds every call
+- Jittered retries: retryable errors are retried with exponential backoff
+- Hedged requests: if a call is slower than the usual p95, fire a duplicate
+- Circuit breaker: after repeated failures, fail fast instead of waiting
+
+Nodes opt in by wrapping their model:
+
+    llm = ResilientChatModel(ChatAnthropic(model="claude-sonnet-4-5"))
+    llm_with_tools = llm.bind_tools([add, multiply])
+
+    agent.invoke(inputs, config=with_deadline(config, seconds=10))
+"""
+
+import contextvars
+import random
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ensure_config
+
+try:
+    import anthropic
+except ImportError:  # Only needed to recognise Anthropic SDK errors
+    anthropic = None
+
+
+# Errors
+# ------
+class DeadlineExceeded(TimeoutError):
+    """Raised when the graph-run deadline passes before the model answers"""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker for a model is open (failing fast)"""
+
+
+# HTTP status codes worth retrying: timeouts, rate limits, overloaded servers
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Decide whether an error is transient and the call should be retried."""
+    if isinstance(error, (CircuitOpenError, DeadlineExceeded)):
+        return False
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:  # The server answered: its status code decides
+        return status_code in RETRYABLE_STATUS_CODES
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if anthropic is not None and isinstance(error, anthropic.APIConnectionError):
+        return True
+    return False
+
+
+# Deadlines
+# ---------
+# The deadline lives in the run config as an absolute epoch timestamp, so it
+# survives being passed from the graph into every node and nested call.
+DEADLINE_KEY = "deadline"
+
+
+def with_deadline(config: Optional[RunnableConfig], seconds: float) -> RunnableConfig:
+    """Return a copy of `config` whose calls must finish within `seconds`."""
+    config = dict(config or {})
+    configurable = dict(config.get("configurable", {}))
+    configurable[DEADLINE_KEY] = time.time() + seconds
+    config["configurable"] = configurable
+    return config
+
+
+def remaining_time(config: Optional[RunnableConfig] = None) -> Optional[float]:
+    """Seconds left before the run deadline, or None if there is no deadline.
+
+    Inside a LangGraph node the run config is picked up automatically, so
+    nodes don't need to pass `config` along themselves.
+    """
+    deadline = ensure_config(config).get("configurable", {}).get(DEADLINE_KEY)
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+# Policies
+# --------
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with "full jitter" between attempts"""
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+
+    def backoff(self, attempt: int) -> float:
+        """Sleep time before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+@dataclass
+class HedgePolicy:
+    """Send a duplicate request when the first one is slower than usual"""
+    percentile: float = 95.0  # Hedge once we're slower than this percentile
+    min_samples: int = 20  # Don't hedge until we know what "usual" looks like
+    max_hedges: int = 1  # Extra requests allowed per attempt
+    window: int = 200  # Number of recent latencies to remember
+
+
+class CircuitBreaker:
+    """
+    Classic three-state circuit breaker.
+
+    - closed: calls go through, consecutive failures are counted
+    - open: calls fail immediately with CircuitOpenError
+    - half_open: after `reset_timeout`, one trial call is allowed through
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError("circuit open: model is failing, not calling it")
+                self.state = "half_open"
+            elif self.state == "half_open":
+                raise CircuitOpenError("circuit half-open: trial call already in flight")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def release(self) -> None:
+        """The call ended without telling us anything about the model's health."""
+        with self._lock:
+            if self.state == "half_open":
+                # Give the trial back: the next call may try again right away
+                self.state = "open"
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+# Per-model health: one breaker and one latency history per model name
+# ---------------------------------------------------------------------
+@dataclass
+class ModelHealth:
+    breaker: CircuitBreaker
+    latencies: deque = field(default_factory=lambda: deque(maxlen=200))
+
+    def hedge_delay(self, policy: HedgePolicy) -> Optional[float]:
+        """The latency percentile after which we send a hedged request."""
+        if len(self.latencies) < policy.min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * policy.percentile / 100))
+        return ordered[index]
+
+
+_health: dict[str, ModelHealth] = {}
+_health_lock = threading.Lock()
+
+
+def model_health(model_name: str, **breaker_options) -> ModelHealth:
+    """
+    Get (or create) the shared health record for a model.
+
+    The breaker is created by the first caller for a model name; later
+    callers share it, and their `breaker_options` can't change it (we warn
+    if they differ). Pass a different `model_name` for a separate breaker.
+    """
+    with _health_lock:
+        if model_name not in _health:
+            _health[model_name] = ModelHealth(breaker=CircuitBreaker(**breaker_options))
+            return _health[model_name]
+        health = _health[model_name]
+    differing = {
+        option: value for option, value in breaker_options.items()
+        if getattr(health.breaker, option) != value
+    }
+    if differing:
+        warnings.warn(
+            f"model {model_name!r} already has a circuit breaker; ignoring {differing} "
+            "(pass model_name=... for a separate one)",
+            stacklevel=3,
+        )
+    return health
+
+
+def _model_name(model: Any) -> str:
+    for attr in ("model", "model_name"):
+        name = getattr(model, attr, None)
+        if isinstance(name, str):
+            return name
+    return type(model).__name__
+
+
+def _run_in_thread(fn, *args, **kwargs) -> Future:
+    """
+    Run one attempt (or hedge) on its own daemon thread. A shared pool would
+    make new attempts queue behind timed-out ones and losing hedges that are
+    still running, and that queueing time would count against the timeout.
+    """
+    future: Future = Future()
+    context = contextvars.copy_context()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(context.run(fn, *args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+
+    threading.Thread(target=target, name="resilient-llm", daemon=True).start()
+    return future
+
+
+# The Wrapper
+# -----------
+class ResilientChatModel:
+    """
+    Wraps a chat model so every `invoke` gets deadlines, retries, hedging
+    and a circuit breaker. Drop-in replacement for `llm.invoke(messages)`.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+        attempt_timeout: Optional[float] = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        model_name: Optional[str] = None,
+    ):
+        self.model = model
+        self.retry = retry or RetryPolicy()
+        self.hedge = hedge  # None = no hedging
+        self.attempt_timeout = attempt_timeout
+        self.model_name = model_name or _model_name(model)
+        self.health = model_health(
+            self.model_name,
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+        )
+        if self.hedge is not None:
+            self.health.latencies = deque(self.health.latencies, maxlen=self.hedge.window)
+
+    def bind_tools(self, tools: list, **kwargs) -> "ResilientChatModel":
+        """Bind tools to the inner model; the result shares this model's breaker."""
+        bound = ResilientChatModel.__new__(ResilientChatModel)
+        bound.__dict__.update(self.__dict__)
+        bound.model = self.model.bind_tools(tools, **kwargs)
+        return bound
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs) -> Any:
+        config = ensure_config(config)
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(1, self.retry.max_attempts + 1):
+            timeout = self._attempt_timeout(config)
+            self.health.breaker.before_call()
+            try:
+                result = self._call_with_hedging(input, config, timeout, **kwargs)
+            except Exception as error:
+                if isinstance(error, DeadlineExceeded):
+                    # The caller's deadline was too tight; that says nothing about the model
+                    self.health.breaker.release()
+                    raise
+                if not is_retryable(error):
+                    # e.g. a 400 Bad Request: our fault, not the model's health
+                    self.health.breaker.release()
+                    raise
+                self.health.breaker.record_failure()
+                last_error = error
+            else:
+                self.health.breaker.record_success()
+                return result
+
+            if attempt == self.retry.max_attempts:
+                break
+            # Back off, but never sleep past the deadline
+            delay = self.retry.backoff(attempt)
+            left = remaining_time(config)
+            if left is not None and delay >= left:
+                raise DeadlineExceeded("deadline would pass while backing off") from last_error
+            time.sleep(delay)
+
+        raise last_error
+
+    # Helpers
+    # -------
+    def _attempt_timeout(self, config: RunnableConfig) -> Optional[float]:
+        left = remaining_time(config)
+        if left is not None and left <= 0:
+            raise DeadlineExceeded("graph-run deadline already passed")
+        if left is None:
+            return self.attempt_timeout
+        if self.attempt_timeout is None:
+            return left
+        return min(left, self.attempt_timeout)
+
+    def _timed_call(self, input: Any, config: RunnableConfig, **kwargs) -> Any:
+        start = time.perf_counter()
+        result = self.model.invoke(input, config=config, **kwargs)
+        self.health.latencies.append(time.perf_counter() - start)
+        return result
+
+    def _call_with_hedging(
+        self, input: Any, config: RunnableConfig, timeout: Optional[float], **kwargs
+    ) -> Any:
+        start = time.perf_counter()
+        pending = {_run_in_thread(self._timed_call, input, config, **kwargs)}
+        hedges_left = self.hedge.max_hedges if self.hedge else 0
+        errors = []
+
+        while pending:
+            elapsed = time.perf_counter() - start
+            wait_for = None if timeout is None else max(0.0, timeout - elapsed)
+
+            # Wake up early if it's time to send a hedged duplicate
+            hedge_at = self.health.hedge_delay(self.hedge) if hedges_left else None
+            hedging = hedge_at is not None and (wait_for is None or hedge_at - elapsed < wait_for)
+            if hedging:
+                wait_for = max(0.0, hedge_at - elapsed)
+
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()  # First success wins; losers finish in the background
+                errors.append(future.exception())
+
+            if not done and hedging:
+                pending.add(_run_in_thread(self._timed_call, input, config, **kwargs))
+                hedges_left -= 1
+            elif not done:
+                if remaining_time(config) is not None and remaining_time(config) <= 0:
+                    raise DeadlineExceeded("model call did not finish before the deadline")
+                raise TimeoutError(f"model call took longer than {timeout:.2f}s")
+
+        raise errors[0]
@@ -0,0 +1,397 @@
+"""
+Thread Index
+============
+Query checkpointed threads without replaying them one by one.
+
+Checkpointers are keyed by thread_id: to find "every thread routed to
+billing" you'd have to call `get_state` on every thread you know about.
+
+`IndexedCheckpointSaver` wraps any checkpointer. Every time the root graph
+saves a checkpoint, it also updates one row per thread in a small SQLite
+table, with secondary indexes on:
+- `category` (from Episode 3's SupportState)
+- `updated_at` (the checkpoint timestamp)
+- `message_count` (length of the `messages` channel)
+
+It also records which hours each thread was active in (one row per thread
+per hour), so hourly counts don't change once the hour is over.
+
+On top of that it offers:
+- `find_threads()`: one page of matching threads + a cursor for the next page
+- `scan_threads()`: streams every match page by page (never all in memory)
+- `counts_per_category_per_hour()`: aggregation for dashboards
+
+Usage:
+
+    checkpointer = IndexedCheckpointSaver(MemorySaver())
+    agent = create_support_agent(checkpointer=checkpointer)
+    ...
+    page = checkpointer.find_threads(category="billing", page_size=50)
+"""
+
+import base64
+import json
+import math
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+
+
+# Step 1: The Index Table
+# ------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id     TEXT PRIMARY KEY,
+    checkpoint_id TEXT NOT NULL,
+    category      TEXT,
+    updated_at    REAL NOT NULL,
+    message_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_by_category ON threads (category, updated_at DESC, thread_id);
+CREATE INDEX IF NOT EXISTS threads_by_category_id ON threads (category, thread_id);
+CREATE INDEX IF NOT EXISTS threads_by_updated ON threads (updated_at DESC, thread_id);
+CREATE INDEX IF NOT EXISTS threads_by_messages ON threads (message_count, updated_at DESC, thread_id);
+
+-- One row per thread per hour it was active in, with its category at the end of that hour
+CREATE TABLE IF NOT EXISTS activity (
+    hour      INTEGER NOT NULL,  -- Unix timestamp // 3600
+    thread_id TEXT NOT NULL,
+    category  TEXT,
+    PRIMARY KEY (hour, thread_id)
+);
+"""
+
+UPSERT = """
+INSERT INTO threads (thread_id, checkpoint_id, category, updated_at, message_count)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (thread_id) DO UPDATE SET
+    checkpoint_id = excluded.checkpoint_id,
+    category = excluded.category,
+    updated_at = excluded.updated_at,
+    message_count = excluded.message_count
+"""
+
+RECORD_ACTIVITY = """
+INSERT INTO activity (hour, thread_id, category) VALUES (?, ?, ?)
+ON CONFLICT (hour, thread_id) DO UPDATE SET category = excluded.category
+"""
+
+
+@dataclass
+class ThreadRow:
+    """What the index knows about a thread (as of its latest checkpoint)"""
+    thread_id: str
+    checkpoint_id: str
+    category: Optional[str]
+    updated_at: float  # Unix timestamp
+    message_count: int
+
+
+@dataclass
+class Page:
+    """One page of results. Pass `next_cursor` back to get the next page."""
+    threads: list[ThreadRow]
+    next_cursor: Optional[str]
+
+
+def _encode_cursor(row: ThreadRow) -> str:
+    # Keyset pagination: remember where we stopped, not an offset
+    raw = json.dumps([row.updated_at, row.thread_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _hour(timestamp: float) -> int:
+    return int(timestamp // 3600)
+
+
+def _decode_cursor(cursor: str) -> tuple[float, str]:
+    updated_at, thread_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return updated_at, thread_id
+
+
+def _timestamp(checkpoint: Checkpoint) -> float:
+    ts = checkpoint.get("ts")
+    if not ts:
+        return datetime.now(timezone.utc).timestamp()
+    return datetime.fromisoformat(ts).timestamp()
+
+
+def _filters(category, updated_after, updated_before, min_messages, max_messages) -> tuple[list, list]:
+    """SQL conditions (and their parameters) shared by every thread query."""
+    where, params = [], []
+    if category is not None:
+        where.append("category = ?")
+        params.append(category)
+    if updated_after is not None:
+        where.append("updated_at >= ?")
+        params.append(updated_after)
+    if updated_before is not None:
+        where.append("updated_at < ?")
+        params.append(updated_before)
+    if min_messages is not None:
+        where.append("message_count >= ?")
+        params.append(min_messages)
+    if max_messages is not None:
+        where.append("message_count <= ?")
+        params.append(max_messages)
+    return where, params
+
+
+# Step 2: The Indexing Checkpointer
+# ----------------------------------
+class IndexedCheckpointSaver(BaseCheckpointSaver):
+    """
+    Wraps a checkpointer and keeps a queryable index of its threads.
+
+    Args:
+        saver: The checkpointer that actually stores the state.
+        path: SQLite database for the index (default: in memory).
+    """
+
+    def __init__(self, saver: BaseCheckpointSaver, path: str = ":memory:"):
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    # Writing: store the checkpoint, then update the index
+    # -----------------------------------------------------
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        saved = self.saver.put(config, checkpoint, metadata, new_versions)
+        if config["configurable"].get("checkpoint_ns", "") == "":  # Root graph only
+            self.index(config["configurable"]["thread_id"], checkpoint)
+        return saved
+
+    def index(self, thread_id: str, checkpoint: Checkpoint) -> None:
+        """Update the index row of a thread from its latest checkpoint."""
+        values = checkpoint.get("channel_values", {})
+        updated_at = _timestamp(checkpoint)
+        row = (
+            thread_id,
+            checkpoint["id"],
+            values.get("category"),
+            updated_at,
+            len(values.get("messages", [])),
+        )
+        with self._lock, self._db:
+            self._db.execute(UPSERT, row)
+            self._db.execute(RECORD_ACTIVITY, (_hour(updated_at), thread_id, values.get("category")))
+
+    def bulk_index(self, rows: Sequence[ThreadRow]) -> None:
+        """Load many index rows at once (e.g. rebuilding the index)."""
+        with self._lock, self._db:
+            self._db.executemany(UPSERT, [
+                (r.thread_id, r.checkpoint_id, r.category, r.updated_at, r.message_count)
+                for r in rows
+            ])
+            self._db.executemany(RECORD_ACTIVITY, [
+                (_hour(r.updated_at), r.thread_id, r.category) for r in rows
+            ])
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.saver.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.saver.delete_thread(thread_id)
+        self._unindex(thread_id)
+
+    def _unindex(self, thread_id: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+            self._db.execute("DELETE FROM activity WHERE thread_id = ?", (thread_id,))
+
+    # Reading checkpoints: straight through to the wrapped saver
+    # ----------------------------------------------------------
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.saver.get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        return self.saver.list(config, filter=filter, before=before, limit=limit)
+
+    def get_next_version(self, current, channel):
+        return self.saver.get_next_version(current, channel)
+
+    # Querying the index
+    # ------------------
+    def find_threads(
+        self,
+        category: Optional[str] = None,
+        updated_after: Optional[float] = None,
+        updated_before: Optional[float] = None,
+        min_messages: Optional[int] = None,
+        max_messages: Optional[int] = None,
+        page_size: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Page:
+        """
+        One page of threads matching every given filter, most recently
+        updated first. Timestamps are Unix timestamps.
+
+        The cursor is a position in `updated_at` order: a thread updated
+        while you page moves to the front, so later pages won't return it.
+        Use `scan_threads()` to visit every match exactly once.
+        """
+        where, params = _filters(category, updated_after, updated_before, min_messages, max_messages)
+        if cursor is not None:
+            # Rows strictly after the last one we returned, in (updated_at DESC, thread_id) order
+            last_updated, last_thread = _decode_cursor(cursor)
+            where.append("(updated_at < ? OR (updated_at = ? AND thread_id > ?))")
+            params.extend([last_updated, last_updated, last_thread])
+
+        rows = self._select(where, params, "updated_at DESC, thread_id", page_size)
+        next_cursor = _encode_cursor(rows[-1]) if len(rows) == page_size else None
+        return Page(threads=rows, next_cursor=next_cursor)
+
+    def scan_threads(
+        self,
+        page_size: int = 1000,
+        category: Optional[str] = None,
+        updated_after: Optional[float] = None,
+        updated_before: Optional[float] = None,
+        min_messages: Optional[int] = None,
+        max_messages: Optional[int] = None,
+    ) -> Iterator[ThreadRow]:
+        """
+        Stream every matching thread, fetching one page at a time.
+
+        Pages are keyed on `thread_id`, which never changes, so a thread
+        updated mid-scan is still returned exactly once (with whatever
+        values its row has when its page is read). Threads created
+        mid-scan are returned only if their ID sorts after the current page.
+        """
+        last_thread = None
+        while True:
+            where, params = _filters(category, updated_after, updated_before, min_messages, max_messages)
+            if last_thread is not None:
+                where.append("thread_id > ?")
+                params.append(last_thread)
+            rows = self._select(where, params, "thread_id", page_size)
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last_thread = rows[-1].thread_id
+
+    def _select(self, where: List[str], params: List[Any], order_by: str, limit: int) -> List[ThreadRow]:
+        sql = "SELECT thread_id, checkpoint_id, category, updated_at, message_count FROM threads"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} LIMIT ?"
+        with self._lock:
+            return [ThreadRow(*row) for row in self._db.execute(sql, [*params, limit])]
+
+    def count_threads(self, category: Optional[str] = None) -> int:
+        with self._lock:
+            if category is None:
+                return self._db.execute("SELECT COUNT(*) FROM threads").fetchone()[0]
+            return self._db.execute(
+                "SELECT COUNT(*) FROM threads WHERE category = ?", (category,)
+            ).fetchone()[0]
+
+    def index_bytes(self) -> int:
+        """Size of the index database (tables + secondary indexes)."""
+        with self._lock:
+            page_count = self._db.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._db.execute("PRAGMA page_size").fetchone()[0]
+        return page_count * page_size
+
+    def counts_per_category_per_hour(
+        self, since: Optional[float] = None, until: Optional[float] = None
+    ) -> List[tuple[str, Optional[str], int]]:
+        """
+        How many threads were active (saved a checkpoint) in each hour, per
+        category. A thread counts once per hour, under the category it had
+        at the end of that hour, so finished hours never change.
+        `since` / `until` pick the whole hours they fall in.
+        Returns (hour as ISO string, category, count), oldest hour first.
+        """
+        sql = "SELECT hour, category, COUNT(*) FROM activity"
+        where, params = [], []
+        if since is not None:
+            where.append("hour >= ?")
+            params.append(_hour(since))
+        if until is not None:
+            where.append("hour < ?")
+            params.append(math.ceil(until / 3600))  # Hours that start before `until`
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " GROUP BY hour, category ORDER BY hour, category"
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            (datetime.fromtimestamp(hour * 3600, timezone.utc).isoformat(), category, count)
+            for hour, category, count in rows
+        ]
+
+    # Async versions
+    # --------------
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await self.saver.aget_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        async for item in self.saver.alist(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        saved = await self.saver.aput(config, checkpoint, metadata, new_versions)
+        if config["configurable"].get("checkpoint_ns", "") == "":
+            self.index(config["configurable"]["thread_id"], checkpoint)
+        return saved
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self.saver.aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.saver.adelete_thread(thread_id)
+        self._unindex(thread_id)
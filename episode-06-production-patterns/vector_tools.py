@@ -0,0 +1,234 @@
+"""
+Vectorized Tools
+================
+Array-aware arithmetic tools, and a tool node that batches scalar calls.
+
+The `add` and `multiply` tools from Episodes 1-2 take two floats. Ask the
+agent to "multiply every price by 1.2" and the model emits one tool call per
+price - and every call is validated, executed and wrapped in a ToolMessage
+on its own.
+
+This module gives two fixes:
+- `add` / `multiply` that accept numbers, lists or ranges and run on NumPy
+  arrays, so the model can do the whole column in ONE call
+- `BatchedToolNode`, which merges same-named scalar calls from one AIMessage
+  into a single NumPy execution (while still answering every call ID)
+"""
+
+import math
+from collections import defaultdict
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+from pydantic import BaseModel, Field, model_validator
+from typing_extensions import Annotated
+
+from langgraph.prebuilt import ToolNode
+from langgraph.prebuilt.tool_node import msg_content_output
+
+
+# Step 1: Inputs - Numbers, Lists or Ranges
+# ------------------------------------------
+MAX_ELEMENTS = 10_000  # Largest list or range one argument may hold
+MAX_RESULT_ITEMS = 1_000  # Longer results are summarised, not listed
+
+
+class NumberRange(BaseModel):
+    """Evenly spaced numbers from start (inclusive) to stop (exclusive)"""
+    start: float
+    stop: float
+    step: float = Field(default=1.0, description="Spacing between values (not 0)")
+
+    @model_validator(mode="after")
+    def check_size(self) -> "NumberRange":
+        # Validation errors go back to the model as a ToolMessage, so it can retry
+        if self.step == 0:
+            raise ValueError("step must not be 0")
+        count = (self.stop - self.start) / self.step
+        if not math.isfinite(count) or count > MAX_ELEMENTS:
+            raise ValueError(f"range is too long: at most {MAX_ELEMENTS:,} values per argument")
+        return self
+
+
+Numbers = Union[float, Annotated[list[float], Field(max_length=MAX_ELEMENTS)], NumberRange]
+
+
+def to_array(value: Any) -> np.ndarray:
+    """Turn a number, list or range into a NumPy array."""
+    if isinstance(value, dict):
+        value = NumberRange(**value)  # Same checks as a tool call
+    if isinstance(value, NumberRange):
+        return np.arange(value.start, value.stop, value.step, dtype=float)
+    array = np.asarray(value, dtype=float)
+    if array.size > MAX_ELEMENTS:
+        raise ValueError(f"too many values: at most {MAX_ELEMENTS:,} per argument")
+    return array
+
+
+def compact(result: np.ndarray) -> Union[float, int, list]:
+    """
+    Turn a NumPy result back into something small to put in a ToolMessage:
+    scalars stay scalars, and whole numbers lose their ".0".
+    """
+    result = np.round(result, 10)
+    if result.ndim == 0:
+        value = result.item()
+        return int(value) if value.is_integer() else value
+    if np.all(result == np.floor(result)) and np.all(np.abs(result) < 2 ** 53):
+        return result.astype(np.int64).tolist()
+    return result.tolist()
+
+
+def answer(result: np.ndarray) -> Union[float, int, list, dict]:
+    """
+    What a tool returns: `compact(result)`, or for results longer than
+    MAX_RESULT_ITEMS a short summary instead of the whole list.
+    """
+    if result.ndim == 0 or result.size <= MAX_RESULT_ITEMS:
+        return compact(result)
+    return {
+        "count": int(result.size),
+        "first": compact(result[:5]),
+        "last": compact(result[-5:]),
+        "min": compact(result.min()),
+        "max": compact(result.max()),
+        "sum": compact(result.sum()),
+    }
+
+
+# Step 2: Array-Aware Tools
+# --------------------------
+# Same names as the Episode 1-2 tools, so scalar calls still work
+@tool
+def add(a: Numbers, b: Numbers) -> Union[float, list[float], dict]:
+    """Add numbers element-wise. Each argument can be a number, a list of
+    numbers, or a range {"start", "stop", "step"}. A single number is
+    added to every element of a list.
+
+    Args:
+        a: First number(s)
+        b: Second number(s)
+
+    Returns:
+        The sum(s) of a and b (a summary if there are more than 1,000)
+    """
+    result = answer(np.add(to_array(a), to_array(b)))
+    print(f"  🔧 Tool: add({_short(a)}, {_short(b)}) = {_short(result)}")
+    return result
+
+
+@tool
+def multiply(a: Numbers, b: Numbers) -> Union[float, list[float], dict]:
+    """Multiply numbers element-wise. Each argument can be a number, a list
+    of numbers, or a range {"start", "stop", "step"}. A single number
+    multiplies every element of a list (e.g. all prices by 1.2).
+
+    Args:
+        a: First number(s)
+        b: Second number(s)
+
+    Returns:
+        The product(s) of a and b (a summary if there are more than 1,000)
+    """
+    result = answer(np.multiply(to_array(a), to_array(b)))
+    print(f"  🔧 Tool: multiply({_short(a)}, {_short(b)}) = {_short(result)}")
+    return result
+
+
+def _short(value: Any) -> str:
+    """Keep the tool prints readable for long lists."""
+    if isinstance(value, list) and len(value) > 4:
+        return f"[{value[0]}, {value[1]}, ... {len(value)} items]"
+    return str(value)
+
+
+# NumPy kernel behind each tool, used to batch scalar calls
+KERNELS: dict[str, Callable[..., np.ndarray]] = {
+    "add": np.add,
+    "multiply": np.multiply,
+}
+
+
+# Step 3: A Tool Node that Batches Scalar Calls
+# ----------------------------------------------
+class BatchedToolNode:
+    """
+    Drop-in replacement for ToolNode.
+
+    Tool calls from the last AIMessage whose tool has a NumPy kernel and
+    whose arguments are all plain numbers are grouped by tool name. Each
+    group runs as ONE vectorized kernel call. Every other call is passed
+    to a regular ToolNode. Each tool call still gets its own ToolMessage,
+    in the original order.
+    """
+
+    def __init__(self, tools: list, kernels: Optional[dict[str, Callable]] = None, min_batch: int = 2):
+        self.tool_node = ToolNode(tools)
+        self.kernels = KERNELS if kernels is None else kernels
+        self.min_batch = min_batch
+        self.batches_run = 0  # For benchmarks: how many kernel calls we made
+
+    def __call__(self, state: dict) -> dict:
+        message = next(m for m in reversed(state["messages"]) if isinstance(m, AIMessage))
+        tool_calls = list(message.tool_calls)
+
+        # Group scalar calls by tool name; they must pass exactly the tool's arguments
+        groups: dict[str, list[dict]] = defaultdict(list)
+        for call in tool_calls:
+            arg_names = self._arg_names(call["name"])
+            if (
+                arg_names is not None
+                and set(call["args"]) == set(arg_names)
+                and _all_scalar(call["args"])
+            ):
+                groups[call["name"]].append(call)
+
+        results: dict[str, ToolMessage] = {}
+        for name, calls in groups.items():
+            if len(calls) < self.min_batch:
+                continue
+            results.update(self._run_batch(name, calls))
+
+        # Everything we didn't batch goes through the normal ToolNode
+        rest = [call for call in tool_calls if call["id"] not in results]
+        if rest:
+            output = self.tool_node.invoke({"messages": [AIMessage(content="", tool_calls=rest)]})
+            for tool_message in output["messages"]:
+                results[tool_message.tool_call_id] = tool_message
+
+        return {"messages": [results[call["id"]] for call in tool_calls]}
+
+    def _arg_names(self, name: str) -> Optional[list[str]]:
+        """The tool's arguments in signature order, or None if it can't be batched."""
+        tool = self.tool_node.tools_by_name.get(name)
+        if name not in self.kernels or tool is None:
+            return None
+        return list(tool.args)
+
+    def _run_batch(self, name: str, calls: list[dict]) -> dict[str, ToolMessage]:
+        """Run N scalar calls of one tool as a single NumPy operation."""
+        # One column per argument, by name, in the order the kernel takes them
+        columns = [
+            np.array([call["args"][arg] for call in calls], dtype=float)
+            for arg in self._arg_names(name)
+        ]
+        values = self.kernels[name](*columns)
+        self.batches_run += 1
+        print(f"  🔧 Batched {len(calls)} {name} calls into one vectorized call")
+
+        # Each value is formatted on its own, exactly as ToolNode would format
+        # the tool's return value, so batching never changes a ToolMessage
+        return {
+            call["id"]: ToolMessage(
+                content=msg_content_output(compact(value)), name=name, tool_call_id=call["id"]
+            )
+            for call, value in zip(calls, values)
+        }
+
+
+def _all_scalar(args: dict) -> bool:
+    return bool(args) and all(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in args.values()
+    )